@@ -0,0 +1,191 @@
+# app/cli.py
+"""Admin command line tools.
+
+    python -m app.cli init-db
+    python -m app.cli import-products catalogue.csv [--format csv|ndjson] [--batch-size 1000]
+    python -m app.cli rebuild-referral-stats
+    python -m app.cli rebuild-sales-rollups
+    python -m app.cli worker [--processes 2]
+    python -m app.cli compact-points
+    python -m app.cli export-snapshot exports/ [--format parquet|arrow] [--tables orders,...] [--full]
+"""
+import argparse
+import json
+import signal
+import sys
+
+
+def init_db_command(args):
+    from app.db import create_tables
+
+    added = create_tables()
+    print("tables created")
+    for name in added:
+        print(f"added: {name}")
+    return 0
+
+
+def import_products_command(args):
+    from app.db import SessionLocal
+    from app.services.product_import import import_products, read_records
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = import_products(db, read_records(stream, fmt), args.batch_size).as_dict()
+    finally:
+        db.close()
+
+    errors = report.pop("errors")
+    print(json.dumps(report, indent=2))
+    for error in errors[:20]:
+        print(f"row {error['row']}: {error['error']}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+def rebuild_referral_stats_command(args):
+    from app.db import SessionLocal
+    from app.services.referral_graph import rebuild_referral_stats
+
+    db = SessionLocal()
+    try:
+        print(json.dumps(rebuild_referral_stats(db), indent=2))
+    finally:
+        db.close()
+    return 0
+
+
+def rebuild_sales_rollups_command(args):
+    from app.db import SessionLocal
+    from app.services.sales_analytics import rebuild_sales_rollups
+
+    db = SessionLocal()
+    try:
+        print(json.dumps(rebuild_sales_rollups(db), indent=2))
+    finally:
+        db.close()
+    return 0
+
+
+def export_snapshot_command(args):
+    from app.db import SessionLocal
+    from app.services.snapshot_export import export_snapshot
+
+    db = SessionLocal()
+    try:
+        results = export_snapshot(
+            db,
+            args.out_dir,
+            tables=args.tables.split(",") if args.tables else None,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            full=args.full,
+            lag_seconds=args.lag_seconds,
+        )
+    finally:
+        db.close()
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+def worker_command(args):
+    import multiprocessing
+    import threading
+    from app.core.logging_config import setup_logging
+    from app.services.jobs import run_worker
+
+    setup_logging()
+    if args.processes <= 1:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            run_worker(stop)
+        except KeyboardInterrupt:
+            stop.set()
+        return 0
+
+    stop = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_worker_process, args=(stop,)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for process in processes:
+            process.join()
+    return 0
+
+
+def _worker_process(stop):
+    from app.core.logging_config import setup_logging
+    from app.services.jobs import run_worker
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent sets `stop`
+    setup_logging()
+    run_worker(stop)
+
+
+def compact_points_command(args):
+    from app.db import SessionLocal
+    from app.services.points import compact_points
+
+    db = SessionLocal()
+    try:
+        total = {"compacted": 0, "users": 0}
+        while True:
+            result = compact_points(db, args.batch_size)
+            if not result["compacted"]:
+                break
+            total = {k: total[k] + result[k] for k in total}
+    finally:
+        db.close()
+    print(json.dumps(total, indent=2))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_db = commands.add_parser("init-db", help="Create missing tables (run once per deploy, not per worker)")
+    init_db.set_defaults(func=init_db_command)
+
+    importer = commands.add_parser("import-products", help="Bulk import products from CSV or NDJSON")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=["csv", "ndjson"])
+    importer.add_argument("--batch-size", type=int, default=1000)
+    importer.set_defaults(func=import_products_command)
+
+    referrals = commands.add_parser("rebuild-referral-stats", help="Recompute referral paths and aggregates")
+    referrals.set_defaults(func=rebuild_referral_stats_command)
+
+    sales = commands.add_parser("rebuild-sales-rollups", help="Recompute the daily sales rollup from orders")
+    sales.set_defaults(func=rebuild_sales_rollups_command)
+
+    worker = commands.add_parser("worker", help="Run background job workers")
+    worker.add_argument("--processes", type=int, default=1)
+    worker.set_defaults(func=worker_command)
+
+    compactor = commands.add_parser("compact-points", help="Fold settled points ledger rows into users.points")
+    compactor.add_argument("--batch-size", type=int, default=10000)
+    compactor.set_defaults(func=compact_points_command)
+
+    exporter = commands.add_parser("export-snapshot", help="Write new rows since the last export as columnar files")
+    exporter.add_argument("out_dir")
+    exporter.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    exporter.add_argument("--tables", help="comma-separated subset of orders,billing_details,product_basic,product_details")
+    exporter.add_argument("--chunk-size", type=int, default=50000)
+    exporter.add_argument("--full", action="store_true", help="ignore the watermark and export everything")
+    exporter.add_argument("--lag-seconds", type=int, default=60, help="skip rows younger than this (open transactions); product tables have no timestamp, re-export them with --full")
+    exporter.set_defaults(func=export_snapshot_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,12 +16,86 @@ class Settings:
     # ✅ Encode password to handle @, #, $, etc.
     ENCODED_PASSWORD = quote_plus(MYSQL_PASSWORD)
 
-    DATABASE_URL: str = (
-        f"mysql+mysqlconnector://{MYSQL_USER}:{ENCODED_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
+    DATABASE_URL: str = os.getenv(
+        "DATABASE_URL",
+        f"mysql+mysqlconnector://{MYSQL_USER}:{ENCODED_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}",
     )
 
+    # Optional; derived from DATABASE_URL (mysqlconnector -> aiomysql, sqlite -> aiosqlite)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+
+    # ✅ Connection pool (per worker: total connections = workers * (size + overflow))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # below MySQL wait_timeout
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # ✅ Startup: schema is created by `python -m app.cli init-db`, not on every worker boot
+    DB_CREATE_TABLES_ON_STARTUP: bool = os.getenv("DB_CREATE_TABLES_ON_STARTUP", "false").lower() == "true"
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+    DB_POOL_WARM: int = int(os.getenv("DB_POOL_WARM", "4"))  # connections opened per engine in the lifespan hook
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "mysecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # ✅ Bearer auth: verified token -> principal cache (per worker); enforcement is opt-in during rollout
+    AUTH_REQUIRED: bool = os.getenv("AUTH_REQUIRED", "false").lower() == "true"
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))  # bounds staleness of is_admin
+
+    # ✅ Dedicated bcrypt process pool (per worker)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    # Hashes waiting or running, a few per process: a full queue answers 503 instead of piling up requests
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", str(4 * PASSWORD_HASH_WORKERS)))
+
+    # ✅ In-process product cache (per worker)
+    PRODUCT_CACHE_SIZE: int = int(os.getenv("PRODUCT_CACHE_SIZE", "10000"))
+    PRODUCT_CACHE_TTL_SECONDS: int = int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "300"))
+
+    # ✅ Logging: JSON lines via a queue listener thread (stdout by default)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Empty = JSON lines on stdout; set a path for per-process rotating files (logs/app.<pid>.log)
+    LOG_FILE: str = os.getenv("LOG_FILE", "")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_TO_CONSOLE: bool = os.getenv("LOG_TO_CONSOLE", "false").lower() == "true"  # also echo to stdout when LOG_FILE is set
+    # Per-logger caps (records/sec) for INFO and below on hot paths
+    LOG_RATE_LIMITS: str = os.getenv("LOG_RATE_LIMITS", "user_store_logger=200,admin_logger=200,auth_logger=200")
+
+    # ✅ Referral leaderboards: top-N kept in memory per worker, re-read from the index after the TTL
+    REFERRAL_LEADERBOARD_SIZE: int = int(os.getenv("REFERRAL_LEADERBOARD_SIZE", "100"))
+    REFERRAL_LEADERBOARD_TTL_SECONDS: int = int(os.getenv("REFERRAL_LEADERBOARD_TTL_SECONDS", "30"))
+
+    # ✅ Sales analytics: report cache per worker (order writes in the same worker clear it)
+    ANALYTICS_CACHE_TTL_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "10"))
+
+    # ✅ Background jobs (DB-backed queue). 0 threads = run `python -m app.cli worker` separately
+    JOB_WORKER_THREADS: int = int(os.getenv("JOB_WORKER_THREADS", "1"))
+    JOB_BATCH_SIZE: int = int(os.getenv("JOB_BATCH_SIZE", "20"))
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE_SECONDS: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+    JOB_RETRY_MAX_SECONDS: float = float(os.getenv("JOB_RETRY_MAX_SECONDS", "300"))
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))  # a claimed job past its lease is reclaimed on poll
+    JOB_RETENTION_HOURS: int = int(os.getenv("JOB_RETENTION_HOURS", "72"))
+
+    # ✅ Idempotency-Key responses are replayed for this long, then purged by the job workers
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = int(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+
+    # ✅ Points ledger: compaction into users.points runs from the job workers
+    POINTS_COMPACTION_INTERVAL_SECONDS: int = int(os.getenv("POINTS_COMPACTION_INTERVAL_SECONDS", "60"))
+    POINTS_COMPACTION_LAG_SECONDS: int = int(os.getenv("POINTS_COMPACTION_LAG_SECONDS", "60"))
+    POINTS_BALANCE_CACHE_TTL_SECONDS: int = int(os.getenv("POINTS_BALANCE_CACHE_TTL_SECONDS", "5"))
+
+    # ✅ Metrics: requests issuing more SQL statements than this are flagged (N+1 guard)
+    METRICS_QUERY_BUDGET: int = int(os.getenv("METRICS_QUERY_BUDGET", "20"))
+
+    # ✅ Product JSON is built without Pydantic; set to true in dev to re-validate every payload
+    VALIDATE_PRODUCT_PAYLOADS: bool = os.getenv("VALIDATE_PRODUCT_PAYLOADS", "false").lower() == "true"
+
 settings = Settings()
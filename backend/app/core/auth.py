@@ -0,0 +1,139 @@
+# app/core/auth.py
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from app.config import settings
+from app.core.cache import LRUCache
+from app.db import SessionLocal
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller, built once per token and served from token_cache"""
+    id: int
+    mobile_no: str
+    username: str
+    is_admin: bool
+
+
+class InvalidToken(Exception):
+    """Raised for malformed, forged or expired access tokens"""
+
+
+# ✅ Verified token -> (principal, exp). Entries never outlive the token, nor AUTH_CACHE_TTL_SECONDS
+token_cache = LRUCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Token verification: direct HMAC for HS256, python-jose otherwise
+# ------------------------------------------------------------------
+def decode_token(token: str) -> dict:
+    if settings.ALGORITHM != "HS256":
+        try:
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError as e:
+            raise InvalidToken(str(e))
+
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+        claims = json.loads(_b64decode(payload_b64))
+    except (ValueError, TypeError):
+        raise InvalidToken("Malformed token")
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise InvalidToken("Malformed token")
+
+    if header.get("alg") != "HS256":
+        raise InvalidToken("Unexpected signing algorithm")
+
+    expected = hmac.new(
+        settings.SECRET_KEY.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256
+    ).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidToken("Signature verification failed")
+
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        raise InvalidToken("Token expired")
+    if not claims.get("sub"):
+        raise InvalidToken("Token has no subject")
+    return claims
+
+
+def _load_principal(mobile_no: str) -> Optional[Principal]:
+    from app.models.user_model import User
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.mobile_no == mobile_no).first()
+        if user is None:
+            return None
+        return Principal(id=user.id, mobile_no=user.mobile_no, username=user.username, is_admin=bool(user.is_admin))
+    finally:
+        db.close()
+
+
+async def authenticate(token: str) -> Principal:
+    """Token -> Principal; only a cache miss verifies the signature and reads the users table"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        principal, exp = cached
+        if exp > time.time():
+            return principal
+        token_cache.invalidate(token)
+
+    claims = decode_token(token)
+    principal = await run_in_threadpool(_load_principal, claims["sub"])
+    if principal is None:
+        raise InvalidToken("Unknown user")
+
+    remaining = claims["exp"] - time.time()
+    token_cache.set(token, (principal, claims["exp"]), ttl=min(remaining, settings.AUTH_CACHE_TTL_SECONDS))
+    return principal
+
+
+# ------------------------------------------------------------------
+# ✅ 2. FastAPI dependencies
+# ------------------------------------------------------------------
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Optional[Principal]:
+    """Bearer token -> Principal. Anonymous calls get None while AUTH_REQUIRED is off"""
+    if credentials is None:
+        if settings.AUTH_REQUIRED:
+            raise _unauthorized("Not authenticated")
+        return None
+
+    try:
+        return await authenticate(credentials.credentials)
+    except InvalidToken as e:
+        raise _unauthorized(str(e))
+
+
+async def require_admin(principal: Optional[Principal] = Depends(get_current_user)) -> Optional[Principal]:
+    """Authenticated callers must be admins. Anonymous calls only get here while AUTH_REQUIRED
+    is off (get_current_user rejects them otherwise): the bundled admin UI sends no token yet"""
+    if principal is None:
+        return None
+    if not principal.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return principal
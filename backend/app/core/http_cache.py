@@ -0,0 +1,137 @@
+# app/core/http_cache.py
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache
+from app.db import SessionLocal, get_async_db
+from app.models.version_model import TableVersion
+
+# Resource names bumped by write paths
+PRODUCTS = "products"
+ORDERS = "orders"
+
+# Versions are re-read at most once a second per worker (local writes clear it immediately)
+_version_cache = LRUCache(maxsize=64, ttl=1)
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Writers: bump after the data change committed, in a short transaction of its own
+#       (inside the write transaction every checkout would queue on the version row)
+# ------------------------------------------------------------------
+def bump_version(*names: str) -> dict[str, int]:
+    """Advance the named versions; returns the new version of each"""
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        for name in names:
+            updated = db.execute(
+                update(TableVersion)
+                .where(TableVersion.name == name)
+                .values(version=TableVersion.version + 1, updated_at=now)
+            ).rowcount
+            if not updated:
+                try:
+                    with db.begin_nested():
+                        db.add(TableVersion(name=name, version=1, updated_at=now))
+                except IntegrityError:
+                    # Created concurrently: bump the row the other writer inserted
+                    db.execute(
+                        update(TableVersion)
+                        .where(TableVersion.name == name)
+                        .values(version=TableVersion.version + 1, updated_at=now)
+                    )
+        versions = dict(db.execute(
+            select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+        ).all())
+        db.commit()
+    finally:
+        db.close()
+    # Cleared only once the new versions are visible, so readers can't re-cache the old ones
+    _version_cache.clear()
+    return versions
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Readers: conditional GET dependency
+# ------------------------------------------------------------------
+def version_etag(versions: dict, *names: str) -> str:
+    """ETag for the given {name: version} (missing names count as version 0)"""
+    return '"' + "-".join(f"{name}.{versions.get(name, 0)}" for name in names) + '"'
+
+
+def _validators(rows: dict, names: tuple) -> tuple[str, Optional[datetime]]:
+    etag = version_etag({name: row.version for name, row in rows.items()}, *names)
+    stamps = [rows[name].updated_at for name in names if name in rows and rows[name].updated_at]
+    last_modified = max(stamps).replace(tzinfo=timezone.utc, microsecond=0) if stamps else None
+    return etag, last_modified
+
+
+def current_etag(db: Session, *names: str) -> str:
+    """ETag of the current versions for sync callers (cache warmers, the search index)"""
+    names = tuple(names)
+    cached = _version_cache.get(names)
+    if cached is not None:
+        return cached[0]
+
+    rows = {row.name: row for row in db.execute(select(TableVersion).where(TableVersion.name.in_(names))).scalars()}
+    versions = _validators(rows, names)
+    _version_cache.set(names, versions)
+    return versions[0]
+
+
+async def _load_versions(db: AsyncSession, names: tuple) -> tuple[str, Optional[datetime]]:
+    cached = _version_cache.get(names)
+    if cached is not None:
+        return cached
+
+    rows = {
+        row.name: row
+        for row in (await db.execute(select(TableVersion).where(TableVersion.name.in_(names)))).scalars()
+    }
+    versions = _validators(rows, names)
+    _version_cache.set(names, versions)
+    return versions
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_get(*names: str, max_age: int = 0):
+    """Dependency factory: answers 304 before the endpoint runs, else returns validator headers.
+
+    Endpoints attach the returned dict to their response.
+    """
+    names = tuple(names)
+
+    async def dependency(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
+        etag, last_modified = await _load_versions(db, names)
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age}, must-revalidate" if max_age else "no-cache",
+        }
+        if last_modified:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if _not_modified(request, etag, last_modified):
+            raise HTTPException(status_code=304, headers=headers)
+        return headers
+
+    return dependency
@@ -0,0 +1,88 @@
+# app/core/ids.py
+import os
+import secrets
+import threading
+import time
+from typing import Callable
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Crockford base32: no I, L, O, U; sorts the same as the numbers it encodes
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Short human-facing codes: also drop 0/1 so codes read back unambiguously
+CODE_ALPHABET = "23456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+CODE_ATTEMPTS = 5
+
+
+class ULIDGenerator:
+    """Time-ordered 128-bit ids (48-bit ms timestamp + 80 random bits), 26 chars.
+
+    Ids from one process are strictly increasing: within the same millisecond the
+    random part is incremented, so inserts append to the right edge of the index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+        self._pid = os.getpid()
+
+    def new(self) -> str:
+        with self._lock:
+            if os.getpid() != self._pid:  # forked worker: don't continue the parent's sequence
+                self._pid, self._last_ms = os.getpid(), -1
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms <= self._last_ms:
+                now_ms = self._last_ms
+                self._last_random += 1
+                if self._last_random >= 1 << 80:  # 2^80 ids in one ms: borrow the next ms
+                    now_ms += 1
+                    self._last_random = secrets.randbits(79)
+            else:
+                self._last_random = secrets.randbits(79)  # top bit clear leaves room to increment
+            self._last_ms = now_ms
+            value = (now_ms << 80) | self._last_random
+        return "".join(CROCKFORD[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+_ulid = ULIDGenerator()
+
+
+def new_ulid() -> str:
+    return _ulid.new()
+
+
+def new_product_id() -> str:
+    return f"PROD-{new_ulid()}"
+
+
+def short_code(length: int, prefix: str = "") -> str:
+    return prefix + "".join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+
+
+# ------------------------------------------------------------------
+# ✅ Unique short codes: let the unique index decide, retry with a longer code
+# ------------------------------------------------------------------
+def insert_with_unique_code(
+    db: Session,
+    obj,
+    attr: str,
+    make_code: Callable[[int], str],
+    attempts: int = CODE_ATTEMPTS,
+) -> None:
+    """Add `obj` with `attr` set to make_code(attempt), retrying on unique-constraint collisions.
+
+    Each try is a savepoint flush, so the caller's transaction survives a collision.
+    Any other IntegrityError (e.g. a different unique column) is re-raised after the last try.
+    """
+    for attempt in range(attempts):
+        setattr(obj, attr, make_code(attempt))
+        try:
+            with db.begin_nested():
+                db.add(obj)
+                db.flush()
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
@@ -0,0 +1,235 @@
+# app/core/metrics.py
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from sqlalchemy import event
+from app.config import settings
+
+logger = logging.getLogger("metrics_logger")
+
+# Seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+QUANTILE_WINDOW = 1024  # recent samples kept per route for the quantile summary
+
+
+class RequestStats:
+    """Per-request SQL counters, shared with threadpool workers through a ContextVar"""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+current_request: contextvars.ContextVar = contextvars.ContextVar("current_request", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = defaultdict(int)                      # (method, route, status) -> count
+        self.latency_buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self.latency_sum = defaultdict(float)                 # (method, route) -> seconds
+        self.latency_count = defaultdict(int)
+        self.latency_window = defaultdict(lambda: deque(maxlen=QUANTILE_WINDOW))
+        self.route_queries = defaultdict(int)                 # route -> SQL statements
+        self.route_query_seconds = defaultdict(float)
+        self.query_budget_exceeded = defaultdict(int)         # route -> requests over budget
+        self.queries_total = 0
+        self.query_seconds_total = 0.0
+        self.startup_seconds = {}                             # phase -> seconds, set by the lifespan hook
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            self.latency_buckets[key][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.latency_sum[key] += seconds
+            self.latency_count[key] += 1
+            self.latency_window[key].append(seconds)
+            self.route_queries[route] += stats.queries
+            self.route_query_seconds[route] += stats.query_seconds
+            if stats.queries > settings.METRICS_QUERY_BUDGET:
+                self.query_budget_exceeded[route] += 1
+
+    def observe_query(self, seconds: float):
+        with self._lock:
+            self.queries_total += 1
+            self.query_seconds_total += seconds
+
+    # ------------------------------------------------------------------
+    # Prometheus text exposition (version 0.0.4)
+    # ------------------------------------------------------------------
+    def render(self) -> str:
+        from app.core.auth import token_cache
+        from app.core.logging_config import dropped_log_records
+        from app.core.security import hash_pool
+        from app.db import pool_stats
+        from app.services.product_catalog import product_cache
+
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                out.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        with self._lock:
+            metric("http_requests_total", "counter", "HTTP requests by route and status", [
+                ({"method": m, "route": r, "status": s}, n) for (m, r, s), n in sorted(self.requests.items())
+            ])
+            metric("http_requests_in_flight", "gauge", "Requests currently being served", [({}, self.in_flight)])
+
+            histogram = []
+            for (m, r), buckets in sorted(self.latency_buckets.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                    cumulative += count
+                    histogram.append(({"method": m, "route": r, "le": bound}, cumulative))
+            out_name = "http_request_duration_seconds"
+            out.append(f"# HELP {out_name} Request latency")
+            out.append(f"# TYPE {out_name} histogram")
+            for labels, value in histogram:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                out.append(f"{out_name}_bucket{{{label_text}}} {value}")
+            for (m, r), total in sorted(self.latency_sum.items()):
+                out.append(f'{out_name}_sum{{method="{m}",route="{r}"}} {total:.6f}')
+                out.append(f'{out_name}_count{{method="{m}",route="{r}"}} {self.latency_count[(m, r)]}')
+
+            quantiles = []
+            for (m, r), window in sorted(self.latency_window.items()):
+                ordered = sorted(window)
+                for q in QUANTILES:
+                    value = ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+                    quantiles.append(({"method": m, "route": r, "quantile": q}, f"{value:.6f}"))
+            metric("http_request_latency_recent_seconds", "gauge",
+                   f"Latency quantiles over the last {QUANTILE_WINDOW} requests per route", quantiles)
+
+            metric("db_queries_total", "counter", "SQL statements executed", [({}, self.queries_total)])
+            metric("db_query_seconds_total", "counter", "Time spent executing SQL",
+                   [({}, f"{self.query_seconds_total:.6f}")])
+            metric("http_request_db_queries_total", "counter", "SQL statements issued per route", [
+                ({"route": r}, n) for r, n in sorted(self.route_queries.items())
+            ])
+            metric("http_request_db_query_seconds_total", "counter", "SQL time per route", [
+                ({"route": r}, f"{s:.6f}") for r, s in sorted(self.route_query_seconds.items())
+            ])
+            metric("http_requests_query_budget_exceeded_total", "counter",
+                   f"Requests issuing more than {settings.METRICS_QUERY_BUDGET} SQL statements", [
+                       ({"route": r}, n) for r, n in sorted(self.query_budget_exceeded.items())
+                   ])
+
+        metric("app_startup_seconds", "gauge", "Cold-start time by phase (import, warm-up steps, total)", [
+            ({"phase": phase}, seconds) for phase, seconds in self.startup_seconds.items()
+        ])
+
+        pool = pool_stats()
+        metric("db_pool_checked_out", "gauge", "Connections checked out", [({}, pool["checked_out"])])
+        metric("db_pool_checkouts_total", "counter", "Pool checkouts", [({}, pool["checkouts"])])
+        metric("db_pool_connects_total", "counter", "New DB connections", [({}, pool["connects"])])
+        if "overflow" in pool:
+            metric("db_pool_overflow", "gauge", "Current pool overflow", [({}, pool["overflow"])])
+
+        hashes = hash_pool.stats()
+        metric("password_hash_jobs_total", "counter", "bcrypt jobs by outcome", [
+            ({"outcome": k}, hashes[k]) for k in ("completed", "failed", "rejected")
+        ])
+        metric("password_hash_in_flight", "gauge", "bcrypt jobs queued or running", [({}, hashes["in_flight"])])
+        metric("password_hash_seconds_total", "counter", "Wall time spent waiting on bcrypt",
+               [({}, f"{hash_pool.total_seconds:.6f}")])
+
+        cache = product_cache.stats()
+        metric("product_cache_requests_total", "counter", "Product cache lookups", [
+            ({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"]),
+        ])
+
+        metric("log_records_dropped_total", "counter", "Log records dropped because the log queue was full",
+               [({}, dropped_log_records())])
+
+        tokens = token_cache.stats()
+        metric("auth_token_cache_requests_total", "counter", "Verified-token cache lookups", [
+            ({"result": "hit"}, tokens["hits"]), ({"result": "miss"}, tokens["misses"]),
+        ])
+
+        return "\n".join(out) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+
+
+# ------------------------------------------------------------------
+# ✅ SQL instrumentation via engine events
+# ------------------------------------------------------------------
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        metrics.observe_query(elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+
+
+# ------------------------------------------------------------------
+# ✅ ASGI middleware: latency, in-flight, per-request query counts
+# ------------------------------------------------------------------
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(stats.queries).encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        with metrics._lock:
+            metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            with metrics._lock:
+                metrics.in_flight -= 1
+            current_request.reset(token)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            metrics.observe_request(scope["method"], route_path, status, elapsed, stats)
+
+            if stats.queries > settings.METRICS_QUERY_BUDGET:
+                logger.warning("QUERY BUDGET EXCEEDED", extra={
+                    "route": route_path,
+                    "method": scope["method"],
+                    "queries": stats.queries,
+                    "budget": settings.METRICS_QUERY_BUDGET,
+                })
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
@@ -18,3 +22,96 @@ def create_access_token(data: dict):
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+# ------------------------------------------------------------------
+# ✅ Bounded process pool for bcrypt (keeps CPU work off the request threadpool)
+# ------------------------------------------------------------------
+class HashPoolBusy(Exception):
+    """Raised when too many hash jobs are already queued"""
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so every uvicorn/gunicorn worker gets its own pool after fork
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool and await the result; raises HashPoolBusy when full.
+
+        Awaited on the event loop, so a login storm never holds threadpool threads.
+        """
+        with self._lock:
+            if self.in_flight >= self.max_queue:
+                self.rejected += 1
+                raise HashPoolBusy("Password hashing queue is full")
+            self.in_flight += 1
+            self.submitted += 1
+            executor = self._get_executor()
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wrap_future(executor.submit(fn, *args))
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                self.total_seconds += elapsed
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "avg_ms": round(self.total_seconds / done * 1000, 2) if done else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Sized from the CPU count: hashes are awaited on the event loop, so the queue holds no
+# threadpool threads and only bounds how long a caller may wait (~max_queue / workers hashes)
+hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=max(settings.PASSWORD_HASH_MAX_QUEUE, settings.PASSWORD_HASH_WORKERS),
+)
+
+
+async def hash_password_pooled(password: str):
+    return await hash_pool.run(hash_password, password)
+
+
+async def verify_password_pooled(plain_password, hashed_password):
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
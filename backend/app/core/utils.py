@@ -0,0 +1,7 @@
+# app/core/utils.py
+from app.core.ids import new_product_id
+
+
+def generate_product_id():
+    """Generate a unique, time-ordered product ID (PROD- + ULID)"""
+    return new_product_id()
@@ -1,10 +1,32 @@
 # app/db.py
-from sqlalchemy import create_engine
+import importlib
+import threading
+from contextlib import AsyncExitStack, ExitStack
+from sqlalchemy import UniqueConstraint, create_engine, event, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # SQLite (local dev / benchmarks) does not use a sized QueuePool
+    if "sqlite" not in url.split("://", 1)[0]:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return kwargs
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -17,3 +39,191 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ------------------------------------------------------------------
+# ✅ Async engine for read-heavy endpoints (same pool settings)
+# ------------------------------------------------------------------
+_ASYNC_DRIVERS = {
+    "mysql+mysqlconnector://": "mysql+aiomysql://",
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def to_async_url(url: str) -> str:
+    for sync_prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL))
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ------------------------------------------------------------------
+# ✅ Schema creation and pool warm-up (engines connect lazily until then)
+# ------------------------------------------------------------------
+MODEL_MODULES = (
+    "app.models.user_model",
+    "app.models.referral_model",
+    "app.models.product_model",
+    "app.models.order_model",
+    "app.models.user_store_model",
+    "app.models.version_model",
+    "app.models.analytics_model",
+    "app.models.export_model",
+    "app.models.job_model",
+    "app.models.points_model",
+)
+
+
+def create_tables() -> list[str]:
+    """Create missing tables and indexes for every model (explicit CLI / opt-in startup step)"""
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
+    Base.metadata.create_all(bind=engine)
+    return upgrade_schema()
+
+
+# Run before creating the named index on a table that may already hold violating rows
+_INDEX_PREPARE = {
+    "uq_user_store_user_product": (
+        # keep the oldest row per (user, product); the derived table lets MySQL read what it deletes
+        "DELETE FROM user_store WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM user_store GROUP BY user_id, product_id) AS keep)",
+        # storefront views that listed the duplicates are rebuilt on their next read
+        "DELETE FROM user_store_views",
+    ),
+}
+
+
+def upgrade_schema() -> list[str]:
+    """Add nullable columns, indexes and unique constraints that create_all skips on pre-existing tables"""
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            ddl = "ALTER TABLE {} ADD COLUMN {} {}".format(
+                quote(table.name), quote(column.name), column.type.compile(dialect=engine.dialect)
+            )
+            if _run_ddl(ddl, lambda: column.name in {c["name"] for c in inspect(engine).get_columns(table.name)}):
+                created.append(f"{table.name}.{column.name}")
+
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        existing |= {uq["name"] for uq in inspector.get_unique_constraints(table.name)}
+
+        wanted = [(ix.name, ix.unique, ix.columns) for ix in table.indexes] + [
+            (c.name, True, c.columns) for c in table.constraints if isinstance(c, UniqueConstraint) and c.name
+        ]
+        for name, unique, columns in wanted:
+            if name in existing:
+                continue
+            ddl = "CREATE {}INDEX {} ON {} ({})".format(
+                "UNIQUE " if unique else "", quote(name), quote(table.name), ", ".join(quote(c.name) for c in columns)
+            )
+            if _run_ddl(ddl, lambda: name in {ix["name"] for ix in inspect(engine).get_indexes(table.name)},
+                        prepare=_INDEX_PREPARE.get(name, ())):
+                created.append(name)
+    return created
+
+
+def _run_ddl(ddl: str, already_applied, prepare=()) -> bool:
+    """Run one upgrade step; False if another worker running the same upgrade got there first"""
+    try:
+        with engine.begin() as conn:
+            for statement in prepare:
+                conn.execute(text(statement))
+            conn.execute(text(ddl))
+        return True
+    except DBAPIError:
+        if already_applied():
+            return False
+        raise
+
+
+def warm_pool(connections: int) -> None:
+    """Open `connections` pooled connections at once so the first requests don't pay connect cost"""
+    with ExitStack() as stack:
+        for _ in range(connections):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+
+async def warm_async_pool(connections: int) -> None:
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(async_engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+# ------------------------------------------------------------------
+# ✅ Pool statistics (checkouts, checkins, new connections, invalidations)
+# ------------------------------------------------------------------
+_pool_counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0, "max_checked_out": 0}
+_pool_lock = threading.Lock()
+_checked_out = 0
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    with _pool_lock:
+        _pool_counters["connects"] += 1
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    global _checked_out
+    with _pool_lock:
+        _pool_counters["checkouts"] += 1
+        _checked_out += 1
+        _pool_counters["max_checked_out"] = max(_pool_counters["max_checked_out"], _checked_out)
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    global _checked_out
+    with _pool_lock:
+        _pool_counters["checkins"] += 1
+        _checked_out = max(_checked_out - 1, 0)
+
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    with _pool_lock:
+        _pool_counters["invalidations"] += 1
+
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    with _pool_lock:
+        stats = dict(_pool_counters, checked_out=_checked_out)
+
+    stats["pool_class"] = type(pool).__name__
+    stats["status"] = pool.status()
+    # QueuePool only: configured size and current overflow
+    if hasattr(pool, "size") and hasattr(pool, "overflow"):
+        max_overflow = getattr(pool, "_max_overflow", settings.DB_MAX_OVERFLOW)
+        stats["size"] = pool.size()
+        stats["overflow"] = pool.overflow()
+        stats["max_overflow"] = max_overflow
+        stats["exhausted"] = pool.checkedout() >= pool.size() + max_overflow
+    return stats
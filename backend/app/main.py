@@ -1,11 +1,97 @@
+import time
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import Base, engine
-from app.routers import auth_router, admin_router, user_store_router,order_router
-from app.models import user_model, referral_model, product_model  # Import models to register them
+from app.config import settings
+from app.db import engine, async_engine, SessionLocal, create_tables, warm_pool, warm_async_pool
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.security import hash_pool
+from app.core.http_cache import PRODUCTS, current_etag
+from app.routers import auth_router, admin_router, user_store_router,order_router, search_router, referral_router, analytics_router, points_router
+from app.services.product_catalog import cache_product_list, list_product_payloads
+from app.services.product_search import search_index
+from app.services.jobs import start_worker_threads
+from app.models import user_model, referral_model, product_model, version_model  # Import models to register them
 from fastapi.staticfiles import StaticFiles
 import os
-app = FastAPI(title="Store Platform")
+
+
+setup_logging()
+logger = logging.getLogger("app")
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
+def build_search_index():
+    db = SessionLocal()
+    try:
+        count = search_index.rebuild(db, current_etag(db, PRODUCTS))
+        logger.info("SEARCH INDEX BUILT", extra={"products": count})
+    except Exception:
+        logger.error("SEARCH INDEX BUILD ERROR", exc_info=True)
+    finally:
+        db.close()
+
+
+def warm_product_list():
+    db = SessionLocal()
+    try:
+        etag = current_etag(db, PRODUCTS)
+        payloads, _ = list_product_payloads(db)
+        cache_product_list(payloads, etag)
+    finally:
+        db.close()
+
+
+async def _timed(phases: dict, name: str, step):
+    """Run one startup step, record its duration; failures are logged, not fatal"""
+    started = time.perf_counter()
+    try:
+        await step()
+    except Exception:
+        logger.error("STARTUP STEP FAILED", extra={"step": name}, exc_info=True)
+    phases[name] = round(time.perf_counter() - started, 4)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    phases = {"import": round(started - _import_started, 4)}
+
+    # ✅ Opt-in only: normally the schema is created once with `python -m app.cli init-db`
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        await _timed(phases, "create_tables", lambda: run_in_threadpool(create_tables))
+
+    # ✅ First DB contact happens here, not at import: warm pools, search index, product list
+    if settings.STARTUP_WARMUP:
+        await _timed(phases, "warm_pool", lambda: run_in_threadpool(warm_pool, settings.DB_POOL_WARM))
+        await _timed(phases, "warm_async_pool", lambda: warm_async_pool(settings.DB_POOL_WARM))
+        await _timed(phases, "search_index", lambda: run_in_threadpool(build_search_index))
+        await _timed(phases, "product_list", lambda: run_in_threadpool(warm_product_list))
+
+    phases["total"] = round(time.perf_counter() - _import_started, 4)
+    metrics.startup_seconds = phases
+    logger.info("STARTUP COMPLETE", extra={"startup_seconds": phases})
+
+    # ✅ In-process job workers (dev / single host); production runs `python -m app.cli worker`
+    job_stop, job_threads = start_worker_threads(settings.JOB_WORKER_THREADS)
+    yield
+    job_stop.set()
+    for thread in job_threads:
+        thread.join(timeout=5)
+    # ✅ Stop bcrypt worker processes with the server
+    hash_pool.shutdown()
+    shutdown_logging()
+
+
+app = FastAPI(title="Store Platform", lifespan=lifespan)
 
 # ✅ Enable CORS
 app.add_middleware(
@@ -14,17 +100,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
-# Create DB Tables
-Base.metadata.create_all(bind=engine)
+# ✅ Latency / in-flight / SQL-per-request metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
 
 # Routers
 app.include_router(auth_router.router)
 app.include_router(admin_router.router)
 app.include_router(user_store_router.router)
 app.include_router(order_router.router)
+app.include_router(search_router.router)
+app.include_router(referral_router.router)
+app.include_router(analytics_router.router)
+app.include_router(points_router.router)
 
 @app.get("/")
 def root():
     return {"message": "Welcome to Store Platform API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text exposition (per worker process)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,22 @@
+# app/models/analytics_model.py
+from sqlalchemy import Column, Integer, String, Float, Date, Index
+from app.db import Base
+
+
+class SalesRollup(Base):
+    __tablename__ = "sales_rollup_daily"
+
+    # ✅ One row per (day, product, country), bumped in the order transaction; reports never scan orders
+    day = Column(Date, primary_key=True)
+    product_id = Column(String(50), primary_key=True)  # product_basic.product_id code
+    country = Column(String(100), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    cost = Column(Float, nullable=False, default=0.0)     # actual_price * units
+    profit = Column(Float, nullable=False, default=0.0)   # product profit * units
+
+    __table_args__ = (
+        Index("ix_sales_rollup_product_day", "product_id", "day"),
+        Index("ix_sales_rollup_country_day", "country", "day"),
+    )
@@ -0,0 +1,14 @@
+# app/models/export_model.py
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db import Base
+
+
+class ExportWatermark(Base):
+    __tablename__ = "export_watermarks"
+
+    # ✅ Highest id already written to a snapshot file, per exported table
+    table_name = Column(String(50), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    last_created_at = Column(DateTime, nullable=True)
+    exported_rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
@@ -0,0 +1,29 @@
+# app/models/job_model.py
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from datetime import datetime
+from app.db import Base
+
+
+class Job(Base):
+    __tablename__ = "background_jobs"
+
+    # ✅ Persistent queue: rows are inserted in the request's own transaction and run by workers
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    dedup_key = Column(String(255), unique=True, nullable=True)  # at most one job per key
+    status = Column(String(20), nullable=False, default="pending")  # pending / running / done / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    locked_until = Column(DateTime, nullable=True)  # lease end; a running job past it is reclaimed on poll
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    # ✅ Claim query: next due pending / lease-expired running jobs; maintenance: old finished jobs
+    __table_args__ = (
+        Index("ix_background_jobs_status_run_at", "status", "run_at"),
+    )
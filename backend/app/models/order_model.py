@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db import Base
@@ -7,21 +7,28 @@ class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, nullable=False)
+    product_id = Column(String(50), nullable=False, index=True)  # product_basic.product_id code
     quantity = Column(Integer, nullable=False)
     total_price = Column(Float, nullable=False)
     status = Column(String(50), default="pending")
     created_at = Column(DateTime, default=datetime.utcnow)
+    checkout_id = Column(String(26), nullable=True, index=True)  # ULID shared by one batch checkout's orders
 
     # ✅ Relationship to BillingDetails
     billing_details = relationship("BillingDetails", back_populates="order", uselist=False)
 
+    # ✅ Keyset pagination for the order feed (newest first)
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
+
 
 class BillingDetails(Base):
     __tablename__ = "billing_details"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
     name = Column(String(255))
     email = Column(String(255))
     phone = Column(String(50))
@@ -33,3 +40,13 @@ class BillingDetails(Base):
 
     # ✅ Relationship back to Order
     order = relationship("Order", back_populates="billing_details")
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    # ✅ Client-supplied Idempotency-Key; the stored response is replayed on retries
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(100), nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # purged after IDEMPOTENCY_KEY_TTL_HOURS
@@ -0,0 +1,30 @@
+# app/models/points_model.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db import Base
+
+
+class PointsLedger(Base):
+    __tablename__ = "points_ledger"
+
+    # ✅ Append-only: every award is an INSERT, so concurrent events never lock the users row
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String(50), nullable=False)
+    ref_key = Column(String(100), unique=True, nullable=True)  # idempotency key of the awarding event
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # ✅ Balance: users.points + SUM(delta) over this user's rows above the compaction watermark
+    __table_args__ = (
+        Index("ix_points_ledger_user_id_id", "user_id", "id"),
+    )
+
+
+class PointsWatermark(Base):
+    __tablename__ = "points_watermark"
+
+    # ✅ Single row: ledger ids <= last_id are already folded into users.points
+    name = Column(String(50), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
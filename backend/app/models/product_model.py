@@ -1,5 +1,5 @@
 # app/models/product_model.py
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -15,11 +15,17 @@ class ProductBasic(Base):
     # Relationship to ProductDetails
     details = relationship("ProductDetails", back_populates="product", cascade="all, delete-orphan")
 
+    # ✅ Listing filters (category, category+type, type)
+    __table_args__ = (
+        Index("ix_product_basic_category_type_id", "category", "type", "id"),
+        Index("ix_product_basic_type_id", "type", "id"),
+    )
+
 class ProductDetails(Base):
     __tablename__ = "product_details"
 
     id = Column(Integer, primary_key=True, index=True)
-    products_id = Column(Integer, ForeignKey("product_basic.id"), nullable=False)
+    products_id = Column(Integer, ForeignKey("product_basic.id"), nullable=False, index=True)
     description = Column(Text, nullable=True)
     features = Column(JSON, nullable=True)  # Add this line
     specifications = Column(JSON, nullable=True)
@@ -32,4 +38,9 @@ class ProductDetails(Base):
 
     product = relationship("ProductBasic", back_populates="details")
 
-
+    # ✅ Listing sorts / range filters, with products_id as keyset tie-breaker
+    __table_args__ = (
+        Index("ix_product_details_price", "price", "products_id"),
+        Index("ix_product_details_margin", "margin", "products_id"),
+        Index("ix_product_details_points", "points", "products_id"),
+    )
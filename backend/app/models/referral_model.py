@@ -1,11 +1,40 @@
 # app/models/referral_model.py
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, func
 from app.db import Base
 
 class Referral(Base):
     __tablename__ = "referrals"
 
     id = Column(Integer, primary_key=True, index=True)
-    referrer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    referrer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     new_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     timestamp = Column(DateTime, server_default=func.now())
+
+
+class ReferralPath(Base):
+    __tablename__ = "referral_paths"
+
+    # ✅ Closure table: one row per (ancestor, descendant) pair at any depth (1 = direct referral)
+    ancestor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
+    depth = Column(Integer, nullable=False)
+
+
+class ReferralStats(Base):
+    __tablename__ = "referral_stats"
+
+    # ✅ Aggregates maintained by the referral.apply job; read with a single key lookup
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    level = Column(Integer, nullable=False, default=0)             # distance from the top of the user's tree
+    direct_count = Column(Integer, nullable=False, default=0)
+    downstream_count = Column(Integer, nullable=False, default=0)  # all levels below the user
+    max_depth = Column(Integer, nullable=False, default=0)         # deepest level below the user
+    points_earned = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # ✅ Leaderboard reads: top-N by each metric
+    __table_args__ = (
+        Index("ix_referral_stats_points", "points_earned", "user_id"),
+        Index("ix_referral_stats_direct", "direct_count", "user_id"),
+        Index("ix_referral_stats_downstream", "downstream_count", "user_id"),
+    )
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey,DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey,DateTime, UniqueConstraint, Text
+from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import relationship
 from app.db import Base
 from sqlalchemy.sql import func
@@ -18,6 +19,12 @@ class UserStore(Base):
         foreign_keys=[product_id],
         primaryjoin="UserStore.product_id==ProductBasic.product_id"
     )
+
+    # ✅ One row per (user, product); duplicates are rejected by the index, not a pre-check
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_user_store_user_product"),
+    )
+
 class Store(Base):
     __tablename__ = "stores"
 
@@ -27,4 +34,15 @@ class Store(Base):
     username = Column(String(100), nullable=False)
     store_code = Column(String(50), unique=True, nullable=False)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class UserStoreView(Base):
+    __tablename__ = "user_store_views"
+
+    # ✅ Materialized storefront: serialized list[ProductOut] per user, kept in sync on store writes
+    user_id = Column(String(50), primary_key=True)
+    payload = Column(Text().with_variant(LONGTEXT(), "mysql"), nullable=False)
+    etag = Column(String(64), nullable=False)
+    product_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,12 @@
+# app/models/version_model.py
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # ✅ Bumped by every write path; drives ETag / Last-Modified of cached GETs
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
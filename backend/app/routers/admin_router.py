@@ -1,35 +1,44 @@
 import logging
-import uuid
-import os
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload  # ✅ Added joinedload
-from app.db import get_db
+import tempfile
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+from app.db import get_db, SessionLocal, pool_stats
 from app.models.product_model import ProductBasic, ProductDetails
 from app.schemas.product_schema import ProductCreate, ProductOut, ProductBasicOut, ProductDetailsOut
+from app.services.product_catalog import (
+    InvalidProductCursor,
+    cache_product_list,
+    cached_product_list,
+    count_products,
+    invalidate_product,
+    iter_products_ndjson,
+    product_cache,
+    query_product_page,
+    list_product_payloads,
+)
+from app.services.product_search import search_index
+from app.services.jobs import job_stats
+from app.services.product_import import clean_product_lists, import_products, read_records
+from app.core.utils import generate_product_id
+from app.core.auth import get_current_user, require_admin
+from app.core.http_cache import PRODUCTS, bump_version, conditional_get
 
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
-
+# Handlers are configured once in app.core.logging_config
 logger = logging.getLogger("admin_logger")
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler("logs/admin.log")
-formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-router = APIRouter(prefix="/admin", tags=["Admin"])
 
+# ✅ Catalogue reads need a signed-in user; everything else is admin-only
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(get_current_user)])
+admin_only = [Depends(require_admin)]
 
-def generate_product_id():
-    """Generate a unique product ID"""
-    return f"PROD-{uuid.uuid4().hex[:8].upper()}"
 
-
-@router.post("/products", response_model=ProductOut)
+@router.post("/products", response_model=ProductOut, dependencies=admin_only)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     """Create a new product with basic info and details"""
     try:
-        logger.info(f"CREATE PRODUCT REQUEST: name={product.name}")
+        logger.info("CREATE PRODUCT REQUEST", extra={"product_name": product.name})
 
         # Generate unique product_id
         product_id = generate_product_id()
@@ -38,30 +47,8 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         profit = product.price - product.actual_price
         margin = (profit / product.actual_price * 100) if product.actual_price > 0 else 0
 
-        # Convert specifications to dict list
-        specifications_list = None
-        if product.specifications and len(product.specifications) > 0:
-            filtered_specs = [
-                {"label": spec.label, "value": spec.value} 
-                for spec in product.specifications 
-                if spec.label and spec.value and spec.label.strip() and spec.value.strip()
-            ]
-            if filtered_specs:
-                specifications_list = filtered_specs
-
-        # Handle features - ensure it's a list or None
-        features_list = None  # ✅ Initialize here BEFORE the if block
-        if product.features and len(product.features) > 0:
-            filtered_features = [
-                f.strip() 
-                for f in product.features 
-                if f and f.strip()
-            ]
-            if filtered_features:
-                features_list = filtered_features
-
-        # Handle images - ensure it's a list or None
-        images_list = product.images if product.images and len(product.images) > 0 else None
+        # Drop empty specifications / features / images
+        lists = clean_product_lists(product)
 
         # Create ProductBasic
         product_basic = ProductBasic(
@@ -78,9 +65,9 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         product_details = ProductDetails(
             products_id=product_basic.id,
             description=product.description,
-            features=features_list,
-            specifications=specifications_list,
-            images=images_list,
+            features=lists["features"],
+            specifications=lists["specifications"],
+            images=lists["images"],
             price=product.price,
             actual_price=product.actual_price,
             profit=profit,
@@ -90,10 +77,14 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         
         db.add(product_details)
         db.commit()
+        version = bump_version(PRODUCTS)[PRODUCTS]
         db.refresh(product_basic)
         db.refresh(product_details)
 
-        logger.info(f"PRODUCT CREATED SUCCESSFULLY: product_id={product_id}, id={product_basic.id}")
+        invalidate_product(product_id)
+        search_index.apply_local_write([(product_basic, product_details)], version)
+
+        logger.info("PRODUCT CREATED SUCCESSFULLY", extra={"product_id": product_id, "id": product_basic.id})
 
         return ProductOut(
             basic=ProductBasicOut.model_validate(product_basic),
@@ -102,46 +93,165 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
 
     except Exception as e:
         db.rollback()
-        logger.error(f"CREATE PRODUCT ERROR: {str(e)}")
+        logger.error("CREATE PRODUCT ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create product: {str(e)}")
         
 @router.get("/products", response_model=list[ProductOut])
-def get_all_products(db: Session = Depends(get_db)):
-    """Fetch all products with basic info and details"""
+def get_all_products(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_points: Optional[int] = None,
+    max_points: Optional[int] = None,
+    sort: Literal["id", "price", "margin", "points"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    db: Session = Depends(get_db),
+    cache_headers: dict = Depends(conditional_get(PRODUCTS)),
+):
+    """Fetch all products with basic info and details.
+
+    Passing limit (or any filter) returns one keyset page instead, with
+    X-Total-Count and X-Next-Cursor response headers.
+    """
+    filters = {
+        "category": category,
+        "type": type,
+        "min_price": min_price,
+        "max_price": max_price,
+        "min_points": min_points,
+        "max_points": max_points,
+    }
+    if limit is not None or cursor or any(v is not None for v in filters.values()):
+        return _get_product_page(db, limit or 50, cursor, sort, order, filters, cache_headers)
+
     try:
         logger.info("GET ALL PRODUCTS REQUEST")
 
-        products = (
-            db.query(ProductBasic)
-            .options(joinedload(ProductBasic.details))
-            .all()
+        # ✅ Serve the already-serialized list when warm
+        cached = cached_product_list(cache_headers["ETag"])
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers=cache_headers)
+
+        # ✅ One tuple query, encoded straight to JSON bytes (no per-row Pydantic)
+        result, missing = list_product_payloads(db)
+        for product_pk in missing:
+            logger.error("Missing details for product", extra={"id": product_pk})
+
+        logger.info("PRODUCT COUNT RETURNED", extra={"count": len(result)})
+        return Response(
+            content=cache_product_list(result, cache_headers["ETag"]),
+            media_type="application/json",
+            headers=cache_headers,
         )
 
-        result = []
+    except Exception as e:
+        logger.error("GET PRODUCTS ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
+
+
+def _get_product_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str],
+    sort: str,
+    order: str,
+    filters: dict,
+    cache_headers: dict,
+):
+    try:
+        logger.info("GET PRODUCT PAGE REQUEST", extra={"limit": limit, "sort": sort, "order": order, "filters": filters})
 
-        for product in products:
-            if not product.details or len(product.details) == 0:
-                logger.error(f"Missing details for product_id={product.id}")
-                continue
+        payloads, next_cursor = query_product_page(db, limit, cursor, sort, order, **filters)
+        headers = dict(cache_headers, **{"X-Total-Count": str(count_products(db, filters))})
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+
+        return Response(
+            content=b"[" + b",".join(payloads) + b"]",
+            media_type="application/json",
+            headers=headers,
+        )
+
+    except InvalidProductCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("GET PRODUCT PAGE ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
 
+
+@router.get("/cache/stats", dependencies=admin_only)
+def get_cache_stats():
+    """Hit/miss counters for the in-process product cache"""
+    return product_cache.stats()
+
+
+@router.get("/jobs/stats", dependencies=admin_only)
+def get_job_stats(db: Session = Depends(get_db)):
+    """Background queue depth by status and how late the oldest due job is"""
+    return job_stats(db)
+
+
+@router.get("/db/pool", dependencies=admin_only)
+def get_pool_stats():
+    """Connection pool usage for sizing against worker counts"""
+    return pool_stats()
+
+
+@router.get("/products/stream", dependencies=admin_only)
+def stream_all_products(batch_size: int = Query(500, ge=1, le=5000)):
+    """Stream the full catalogue as NDJSON (one ProductOut per line)"""
+    logger.info("STREAM PRODUCTS REQUEST", extra={"batch_size": batch_size})
+
+    def generate():
+        # The stream outlives the request dependencies, so it owns its session
+        db = SessionLocal()
+        try:
+            yield from iter_products_ndjson(db, batch_size)
+        except Exception:
+            logger.error("STREAM PRODUCTS ERROR", exc_info=True)
+            raise
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.post("/products/import", dependencies=admin_only)
+async def import_products_bulk(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "ndjson",
+    batch_size: int = Query(1000, ge=1, le=10000),
+):
+    """Bulk import ProductCreate records from a CSV or NDJSON request body"""
+    logger.info("IMPORT PRODUCTS REQUEST", extra={"format": format, "batch_size": batch_size})
+
+    # Spool the body to disk (bounded memory), then import it off the event loop
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        def run_import():
+            db = SessionLocal()
             try:
-                # Get the first (and should be only) details record
-                product_detail = product.details[0]
-                
-                result.append(
-                    ProductOut(
-                        basic=ProductBasicOut.model_validate(product),
-                        details=ProductDetailsOut.model_validate(product_detail)
-                    )
-                )
-            except Exception as validation_error:
-                logger.error(f"Validation error for product {product.id}: {str(validation_error)}")
-                logger.error(f"Product data: basic={product.__dict__}, details={product.details[0].__dict__ if product.details else None}")
-                continue
-
-        logger.info(f"PRODUCT COUNT RETURNED: {len(result)}")
-        return result
+                return import_products(db, read_records(spool, format), batch_size)
+            finally:
+                db.close()
+
+        report = (await run_in_threadpool(run_import)).as_dict()
+        logger.info("IMPORT PRODUCTS DONE", extra={
+            "imported": report["imported"],
+            "failed": report["failed"],
+            "rows_per_sec": report["rows_per_sec"],
+        })
+        return report
 
     except Exception as e:
-        logger.error(f"GET PRODUCTS ERROR: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
\ No newline at end of file
+        logger.error("IMPORT PRODUCTS ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to import products: {str(e)}")
+    finally:
+        spool.close()
@@ -0,0 +1,48 @@
+# app/routers/analytics_router.py
+import logging
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.core.auth import require_admin
+from app.services.sales_analytics import sales_report
+
+# Handlers are configured once in app.core.logging_config
+logger = logging.getLogger("admin_logger")
+
+router = APIRouter(prefix="/admin/analytics", tags=["Analytics"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/sales")
+def get_sales_report(
+    group_by: Literal["product", "category", "day", "week", "country"] = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Revenue, units, cost, profit and margin per group, read from the daily sales rollup"""
+    try:
+        return sales_report(db, group_by, date_from, date_to, country, category, limit)
+
+    except Exception as e:
+        logger.error("SALES REPORT ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to build sales report: {str(e)}")
+
+
+@router.get("/summary")
+def get_sales_summary(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Totals only (dashboard header)"""
+    try:
+        return sales_report(db, "country", date_from, date_to, limit=1000)["totals"]
+
+    except Exception as e:
+        logger.error("SALES SUMMARY ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to build sales summary: {str(e)}")
@@ -2,87 +2,107 @@
 import logging, random
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, UserLogin, UserOut
-from app.core.security import hash_password, verify_password, create_access_token
-from app.services.referral import generate_referral_code, apply_referral
-
+from app.core.security import (
+    HashPoolBusy,
+    create_access_token,
+    hash_password_pooled,
+    hash_pool,
+    verify_password_pooled,
+)
+from app.core.auth import require_admin
+from app.core.ids import insert_with_unique_code
+from app.services.referral import generate_referral_code
+from app.services.jobs import enqueue
+from app.services.job_handlers import REFERRAL_APPLY
+
+# Handlers are configured once in app.core.logging_config
 logger = logging.getLogger("auth_logger")
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler("logs/auth.log")
-formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _find_user(db: Session, mobile_no: str) -> Optional[User]:
+    return db.query(User).filter(User.mobile_no == mobile_no).first()
+
+
+def _create_user(db: Session, user: UserCreate, hashed: str, used_code: Optional[str]) -> User:
+    new_user = User(
+        mobile_no=user.mobile_no,
+        username=user.username,
+        email=user.email,
+        hashed_password=hashed,
+        otp=str(random.randint(100000, 999999)),
+        # prefer referral code from URL (?ref=...) if provided, else use payload
+        referred_by=used_code
+    )
+
+    # ✅ generate referral code: retried (one char longer each time) if the unique index rejects it
+    insert_with_unique_code(
+        db, new_user, "referral_code",
+        lambda attempt: generate_referral_code(user.username, 4 + attempt),
+    )
+
+    # ✅ If user used referral code (from query or payload) → reward referrer in the background;
+    #    the job row commits with the user, so the reward can't be lost
+    if used_code:
+        enqueue(db, REFERRAL_APPLY, {"referral_code": used_code, "new_user_id": new_user.id},
+                dedup_key=f"{REFERRAL_APPLY}:{new_user.id}")
+
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+
+# ✅ async endpoints: bcrypt is awaited on the event loop, DB work runs in short threadpool hops
 @router.post("/register", response_model=UserOut)
-def register_user(
+async def register_user(
     user: UserCreate,
     db: Session = Depends(get_db),
     ref: Optional[str] = Query(None, alias="ref"),
 ):
     try:
-        logger.info(f"REGISTER REQUEST: mobile={user.mobile_no} ref={ref or user.referral_code_used}")
+        logger.info("REGISTER REQUEST", extra={"mobile": user.mobile_no, "ref": ref or user.referral_code_used})
 
-        existing = db.query(User).filter(User.mobile_no == user.mobile_no).first()
+        existing = await run_in_threadpool(_find_user, db, user.mobile_no)
         if existing:
             raise HTTPException(status_code=400, detail="Mobile number already registered")
 
-        hashed = hash_password(user.password)
-        random_otp = str(random.randint(100000, 999999))
+        hashed = await hash_password_pooled(user.password)
+        return await run_in_threadpool(_create_user, db, user, hashed, ref or user.referral_code_used)
 
-        # ✅ generate referral code
-        my_ref_code = generate_referral_code(user.username)
-
-        new_user = User(
-            mobile_no=user.mobile_no,
-            username=user.username,
-            email=user.email,
-            hashed_password=hashed,
-            otp=random_otp,
-            referral_code=my_ref_code,
-            # prefer referral code from URL (?ref=...) if provided, else use payload
-            referred_by=(ref or user.referral_code_used)
-        )
-
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        # ✅ If user used referral code (from query or payload) → reward referrer
-        used_code = ref or user.referral_code_used
-        if used_code:
-            apply_referral(db, used_code, new_user.id)
-
-        return new_user
-
-    except Exception as e:
-        db.rollback()
+    except HTTPException:
+        raise
+    except HashPoolBusy:
+        logger.warning("REGISTER REJECTED: hash pool busy", extra={"mobile": user.mobile_no})
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
+    except Exception:
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail="Registration failed")
 
 
 
 @router.post("/login")
-def login_user(user: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user: UserLogin, db: Session = Depends(get_db)):
     """Login using mobile_no + password"""
     try:
-        logger.info(f"LOGIN REQUEST: mobile={user.mobile_no}")
+        logger.info("LOGIN REQUEST", extra={"mobile": user.mobile_no})
 
-        db_user = db.query(User).filter(User.mobile_no == user.mobile_no).first()
+        db_user = await run_in_threadpool(_find_user, db, user.mobile_no)
         if not db_user:
-            logger.warning(f"LOGIN FAILED: No user for mobile {user.mobile_no}")
+            logger.warning("LOGIN FAILED: no user", extra={"mobile": user.mobile_no})
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        if not verify_password(user.password, db_user.hashed_password):
-            logger.warning(f"LOGIN FAILED: Incorrect password for {user.mobile_no}")
+        if not await verify_password_pooled(user.password, db_user.hashed_password):
+            logger.warning("LOGIN FAILED: incorrect password", extra={"mobile": user.mobile_no})
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
         token = create_access_token({"sub": db_user.mobile_no})
-        logger.info(f"LOGIN SUCCESS: mobile={user.mobile_no}")
+        logger.info("LOGIN SUCCESS", extra={"mobile": user.mobile_no})
 
         return {
             "access_token": token,
@@ -95,6 +115,17 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
             "referral_code": db_user.referral_code
         }
 
-    except Exception as e:
-        logger.error(f"LOGIN ERROR: {str(e)}")
+    except HTTPException:
+        raise
+    except HashPoolBusy:
+        logger.warning("LOGIN REJECTED: hash pool busy", extra={"mobile": user.mobile_no})
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
+    except Exception:
+        logger.error("LOGIN ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail="Login failed")
+
+
+@router.get("/hash-pool/stats", dependencies=[Depends(require_admin)])
+def get_hash_pool_stats():
+    """Queue depth and timing of the bcrypt worker pool"""
+    return hash_pool.stats()
@@ -1,109 +1,202 @@
-from fastapi import APIRouter, HTTPException
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload  # ✅ Added joinedload
-from app.db import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db import get_db, get_async_db
+from app.core.http_cache import ORDERS, PRODUCTS, bump_version, conditional_get
+from app.core.ids import new_ulid
 from app.models.order_model import BillingDetails, Order  # Your ORM models
-from app.schemas.order_schema import BillingDetailsCreate, OrderCreate  # Pydantic schemas
-from app.models.product_model import ProductBasic, ProductDetails
+from app.schemas.order_schema import BatchOrderCreate, BillingDetailsCreate, OrderCreate  # Pydantic schemas
+from app.services.idempotency import IdempotencyConflict, get_stored_response, save_response
+from app.services.order_feed import InvalidCursor, fetch_order_feed
+from app.services.jobs import enqueue
+from app.services.job_handlers import ORDERS_PLACED
 from datetime import datetime
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+def _billing_row(billing_data: BillingDetailsCreate, order_id: int, created_at: datetime) -> dict:
+    return {
+        "order_id": order_id,  # link to order
+        "name": billing_data.name,
+        "email": billing_data.email,
+        "phone": billing_data.phone,
+        "address": billing_data.address,
+        "city": billing_data.city,
+        "zip_code": billing_data.zip_code,
+        "country": billing_data.country,
+        "created_at": created_at,
+    }
+
+
+def _commit_or_replay(db: Session, idempotency_key: Optional[str], endpoint: str, response: dict) -> dict:
+    """Commit once; if a concurrent retry already committed this key, return its response"""
+    if idempotency_key:
+        save_response(db, idempotency_key, endpoint, response)
+    try:
+        db.commit()
+        return response
+    except IntegrityError:
+        db.rollback()
+        stored = get_stored_response(db, idempotency_key, endpoint) if idempotency_key else None
+        if stored is None:
+            raise
+        return stored
+
+
 @router.post("/create")
 def create_order(
     order_data: OrderCreate,
     billing_data: BillingDetailsCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
 ):
     try:
-        # 1️⃣ Insert order first
+        if idempotency_key:
+            stored = get_stored_response(db, idempotency_key, "orders/create")
+            if stored is not None:
+                return stored
+
+        now = datetime.utcnow()
+
+        # ✅ Order + billing in one transaction: one flush, one commit, no refresh
         new_order = Order(
             product_id=order_data.product_id,
             quantity=order_data.quantity,
             total_price=order_data.total_price,
             status="pending",
-            created_at=datetime.utcnow()
+            created_at=now
         )
+        new_billing = BillingDetails(**_billing_row(billing_data, None, now))
+        new_order.billing_details = new_billing
+
         db.add(new_order)
-        db.commit()
-        db.refresh(new_order)
-
-        # 2️⃣ Insert billing details linked to order
-        new_billing = BillingDetails(
-            order_id=new_order.id,  # link to order
-            name=billing_data.name,
-            email=billing_data.email,
-            phone=billing_data.phone,
-            address=billing_data.address,
-            city=billing_data.city,
-            zip_code=billing_data.zip_code,
-            country=billing_data.country,
-            created_at=datetime.utcnow()
-        )
-        db.add(new_billing)
-        db.commit()
-        db.refresh(new_billing)
+        db.flush()
 
-        return {
+        response = {
             "order_id": new_order.id,
             "billing_id": new_billing.id,
             "message": "Order and billing details created successfully"
         }
+        # ✅ Rollups / points / notifications run after the response, from the job queue
+        enqueue(db, ORDERS_PLACED, {"order_ids": [new_order.id], "country": billing_data.country},
+                dedup_key=f"{ORDERS_PLACED}:{new_order.id}")
+        response = _commit_or_replay(db, idempotency_key, "orders/create", response)
+        bump_version(ORDERS)
+        return response
+
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch")
+def create_orders_batch(
+    data: BatchOrderCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+):
+    """Cart checkout: create N orders sharing one billing address in a single transaction"""
+    try:
+        if idempotency_key:
+            stored = get_stored_response(db, idempotency_key, "orders/batch")
+            if stored is not None:
+                return stored
+
+        now = datetime.utcnow()
+        checkout_id = new_ulid()
+
+        # ✅ Orders as one executemany; MySQL has no RETURNING, so ids are read back by checkout_id
+        db.execute(
+            insert(Order),
+            [
+                {
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "total_price": item.total_price,
+                    "status": "pending",
+                    "created_at": now,
+                    "checkout_id": checkout_id,
+                }
+                for item in data.items
+            ],
+        )
+        order_ids = db.execute(
+            select(Order.id).where(Order.checkout_id == checkout_id).order_by(Order.id)
+        ).scalars().all()
+
+        # ✅ Billing rows as one executemany (multi-row insert)
+        db.execute(
+            insert(BillingDetails),
+            [_billing_row(data.billing_data, order_id, now) for order_id in order_ids],
+        )
+
+        response = {
+            "order_ids": order_ids,
+            "message": f"{len(order_ids)} orders created successfully"
+        }
+        enqueue(db, ORDERS_PLACED, {"order_ids": order_ids, "country": data.billing_data.country},
+                dedup_key=f"{ORDERS_PLACED}:{checkout_id}")
+        response = _commit_or_replay(db, idempotency_key, "orders/batch", response)
+        bump_version(ORDERS)
+        return response
 
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/feed")
+async def get_order_feed(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    cache_headers: dict = Depends(conditional_get(ORDERS, PRODUCTS)),
+):
+    """Paginated order feed (newest first) using a (created_at, id) keyset cursor"""
+    try:
+        items, next_cursor = await db.run_sync(
+            fetch_order_feed,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        response.headers.update(cache_headers)
+        return {"items": items, "next_cursor": next_cursor}
+
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/all")
-def get_all_orders(db: Session = Depends(get_db)):
+async def get_all_orders(
+    response: Response,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    cache_headers: dict = Depends(conditional_get(ORDERS, PRODUCTS)),
+):
     try:
-        # Load orders with billing details
-        orders = db.query(Order).options(joinedload(Order.billing_details)).all()
-
-        result = []
-        for order in orders:
-            billing = order.billing_details
-
-            # ✅ Step 1: Find product_basic record using product_id from order
-            product_basic = (
-                db.query(ProductBasic)
-                .filter(ProductBasic.product_id == order.product_id)
-                .first()
-            )
-
-            # ✅ Step 2: If product_basic found, get related images from product_details
-            product_details = None
-            if product_basic:
-                product_details = (
-                    db.query(ProductDetails)
-                    .filter(ProductDetails.products_id == product_basic.id)
-                    .first()
-                )
-
-            result.append({
-                "id": order.id,
-                "product_id": order.product_id,
-                "quantity": order.quantity,
-                "total_price": order.total_price,
-                "status": order.status,
-                "created_at": order.created_at,
-                "billing_details": {
-                    "name": billing.name if billing else None,
-                    "email": billing.email if billing else None,
-                    "phone": billing.phone if billing else None,
-                    "address": billing.address if billing else None,
-                    "city": billing.city if billing else None,
-                    "zip_code": billing.zip_code if billing else None,
-                    "country": billing.country if billing else None,
-                } if billing else None,
-                # ✅ Include product details (id + images)
-                "product_details": {
-                    "id": product_basic.id if product_basic else None,
-                    "images": product_details.images if product_details else None,
-                } if product_basic else None,
-            })
-
-        return result
+        # ✅ Orders, billing details and product images resolved in a constant number of queries
+        items, _ = await db.run_sync(
+            fetch_order_feed, status=status, date_from=date_from, date_to=date_to
+        )
+        response.headers.update(cache_headers)
+        return items
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
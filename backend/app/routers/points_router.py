@@ -0,0 +1,36 @@
+# app/routers/points_router.py
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.core.auth import get_current_user
+from app.services.points import get_balance, get_history
+
+# Handlers are configured once in app.core.logging_config
+logger = logging.getLogger("points_logger")
+
+router = APIRouter(prefix="/points", tags=["Points"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/balance/{user_id}")
+def points_balance(
+    user_id: int,
+    history: int = Query(0, ge=0, le=100),
+    db: Session = Depends(get_db),
+):
+    """Current balance (compacted total + recent ledger entries), optionally with the latest entries"""
+    try:
+        balance = get_balance(db, user_id)
+        if balance is None:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        result = {"user_id": user_id, "points": balance}
+        if history:
+            result["history"] = get_history(db, user_id, history)
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("POINTS BALANCE ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to load points: {str(e)}")
@@ -0,0 +1,39 @@
+# app/routers/referral_router.py
+import logging
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.core.auth import get_current_user
+from app.services.referral_graph import get_referral_stats, leaderboard
+
+# Handlers are configured once in app.core.logging_config
+logger = logging.getLogger("referral_logger")
+
+router = APIRouter(prefix="/referrals", tags=["Referrals"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/stats/{user_id}")
+def referral_stats(user_id: int, db: Session = Depends(get_db)):
+    """Direct/downstream referral counts, tree depth and points earned (precomputed)"""
+    try:
+        return get_referral_stats(db, user_id)
+
+    except Exception as e:
+        logger.error("REFERRAL STATS ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to load referral stats: {str(e)}")
+
+
+@router.get("/leaderboard")
+def referral_leaderboard(
+    by: Literal["points", "direct", "downstream"] = "points",
+    limit: int = Query(10, ge=1),
+    db: Session = Depends(get_db),
+):
+    """Top referrers, served from the in-memory sorted board"""
+    try:
+        return leaderboard.top(db, by, min(limit, leaderboard.size))
+
+    except Exception as e:
+        logger.error("REFERRAL LEADERBOARD ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to load leaderboard: {str(e)}")
@@ -0,0 +1,28 @@
+# app/routers/search_router.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.core.http_cache import PRODUCTS, current_etag
+from app.services.product_search import search_index
+
+router = APIRouter(prefix="/products", tags=["Search"])
+
+
+@router.get("/search")
+def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Prefix full-text search over name, description and features, with category/type facets"""
+    try:
+        # ✅ Pick up product writes made by other workers
+        search_index.refresh(db, current_etag(db, PRODUCTS))
+        return search_index.search(q, category=category, type=type, limit=limit, offset=offset)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -1,49 +1,41 @@
 # app/routers/user_store_router.py
 import logging
-import os
-import uuid
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from app.db import get_db
-from app.models.user_store_model import UserStore,Store
-from app.models.product_model import ProductBasic, ProductDetails
-from app.schemas.user_store_schema import UserStoreCreate, UserStoreOut,StoreCreate, StoreOut
-from app.schemas.product_schema import ProductOut, ProductBasicOut, ProductDetailsOut
-
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
-
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db import get_db, get_async_db
+from app.models.user_store_model import UserStore, UserStoreView, Store
+from app.models.product_model import ProductBasic
+from app.schemas.user_store_schema import UserStoreBulk, UserStoreCreate, UserStoreOut,StoreCreate, StoreOut
+from app.schemas.product_schema import ProductOut
+from app.core.auth import get_current_user
+from app.core.http_cache import PRODUCTS, conditional_get
+from app.core.ids import new_ulid
+from app.services.product_catalog import get_product_payload
+from app.services.store_view import add_to_store_view, build_store_view, remove_from_store_view
+
+# Handlers are configured once in app.core.logging_config
 logger = logging.getLogger("user_store_logger")
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler("logs/user_store.log")
-formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
 
-router = APIRouter(prefix="/user-store", tags=["User Store"])
+router = APIRouter(prefix="/user-store", tags=["User Store"], dependencies=[Depends(get_current_user)])
 
 
 @router.post("/add-product", response_model=UserStoreOut)
 def add_product_to_store(data: UserStoreCreate, db: Session = Depends(get_db)):
     """Add a product to user's store"""
     try:
-        logger.info(f"ADD PRODUCT TO STORE: user_id={data.user_id}, product_id={data.product_id}")
+        logger.info("ADD PRODUCT TO STORE", extra={"user_id": data.user_id, "product_id": data.product_id})
 
         # Check if product exists
         product = db.query(ProductBasic).filter(ProductBasic.product_id == data.product_id).first()
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        # Check if already added
-        existing = db.query(UserStore).filter(
-            UserStore.user_id == data.user_id,
-            UserStore.product_id == data.product_id
-        ).first()
-
-        if existing:
-            raise HTTPException(status_code=400, detail="Product already in store")
-
-        # Create user store entry
+        # Create user store entry (uq_user_store_user_product rejects duplicates)
         user_store = UserStore(
             user_id=data.user_id,
             name=product.name,
@@ -53,17 +45,23 @@ def add_product_to_store(data: UserStoreCreate, db: Session = Depends(get_db)):
         )
 
         db.add(user_store)
-        db.commit()
+        try:
+            db.flush()
+            add_to_store_view(db, data.user_id, [product.product_id])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Product already in store")
         db.refresh(user_store)
 
-        logger.info(f"PRODUCT ADDED TO STORE: id={user_store.id}")
+        logger.info("PRODUCT ADDED TO STORE", extra={"id": user_store.id})
         return user_store
 
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"ADD PRODUCT ERROR: {str(e)}", exc_info=True)
+        logger.error("ADD PRODUCT ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to add product: {str(e)}")
 
 
@@ -71,102 +69,163 @@ def add_product_to_store(data: UserStoreCreate, db: Session = Depends(get_db)):
 def remove_product_from_store(user_id: str, product_id: str, db: Session = Depends(get_db)):
     """Remove a product from user's store"""
     try:
-        logger.info(f"REMOVE PRODUCT FROM STORE: user_id={user_id}, product_id={product_id}")
+        logger.info("REMOVE PRODUCT FROM STORE", extra={"user_id": user_id, "product_id": product_id})
 
-        user_store = db.query(UserStore).filter(
+        # Single DELETE; rowcount tells us whether it was in the store
+        removed = db.query(UserStore).filter(
             UserStore.user_id == user_id,
             UserStore.product_id == product_id
-        ).first()
+        ).delete(synchronize_session=False)
 
-        if not user_store:
+        if not removed:
+            db.rollback()
             raise HTTPException(status_code=404, detail="Product not in store")
 
-        db.delete(user_store)
+        remove_from_store_view(db, user_id, [product_id])
         db.commit()
 
-        logger.info(f"PRODUCT REMOVED FROM STORE: id={user_store.id}")
+        logger.info("PRODUCT REMOVED FROM STORE", extra={"user_id": user_id, "product_id": product_id})
         return {"message": "Product removed successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"REMOVE PRODUCT ERROR: {str(e)}", exc_info=True)
+        logger.error("REMOVE PRODUCT ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to remove product: {str(e)}")
 
 
+@router.post("/add-products")
+def add_products_to_store(data: UserStoreBulk, db: Session = Depends(get_db)):
+    """Add many products to user's store in one request"""
+    try:
+        requested = list(dict.fromkeys(data.product_ids))
+        logger.info("BULK ADD PRODUCTS TO STORE", extra={"user_id": data.user_id, "count": len(requested)})
+
+        # 1 query: resolve products
+        products = db.execute(
+            select(ProductBasic.product_id, ProductBasic.name, ProductBasic.category, ProductBasic.type)
+            .where(ProductBasic.product_id.in_(requested))
+        ).all()
+        found = {p.product_id: p for p in products}
+
+        # 1 query: which are already in the store
+        existing = set(db.execute(
+            select(UserStore.product_id).where(
+                UserStore.user_id == data.user_id,
+                UserStore.product_id.in_(list(found)),
+            )
+        ).scalars())
+
+        to_add = [pid for pid in requested if pid in found and pid not in existing]
+
+        # 1 multi-row INSERT; concurrent duplicates are skipped by the unique index
+        if to_add:
+            db.execute(
+                insert(UserStore)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite"),
+                [
+                    {
+                        "user_id": data.user_id,
+                        "name": found[pid].name,
+                        "product_id": pid,
+                        "category": found[pid].category,
+                        "type": found[pid].type,
+                    }
+                    for pid in to_add
+                ],
+            )
+            add_to_store_view(db, data.user_id, to_add)
+        db.commit()
+
+        logger.info("BULK PRODUCTS ADDED TO STORE", extra={"user_id": data.user_id, "added": len(to_add)})
+        return {
+            "added": to_add,
+            "already_in_store": [pid for pid in requested if pid in existing],
+            "not_found": [pid for pid in requested if pid not in found],
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error("BULK ADD PRODUCTS ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to add products: {str(e)}")
+
+
+@router.post("/remove-products")
+def remove_products_from_store(data: UserStoreBulk, db: Session = Depends(get_db)):
+    """Remove many products from user's store with a single DELETE"""
+    try:
+        logger.info("BULK REMOVE PRODUCTS FROM STORE", extra={"user_id": data.user_id, "count": len(data.product_ids)})
+
+        removed = db.execute(
+            delete(UserStore).where(
+                UserStore.user_id == data.user_id,
+                UserStore.product_id.in_(data.product_ids),
+            )
+        ).rowcount
+        if removed:
+            remove_from_store_view(db, data.user_id, data.product_ids)
+        db.commit()
+
+        logger.info("BULK PRODUCTS REMOVED FROM STORE", extra={"user_id": data.user_id, "removed": removed})
+        return {"removed": removed}
+
+    except Exception as e:
+        db.rollback()
+        logger.error("BULK REMOVE PRODUCTS ERROR", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to remove products: {str(e)}")
+
+
 @router.get("/my-products/{user_id}", response_model=list[ProductOut])
-def get_user_store_products(user_id: str, db: Session = Depends(get_db)):
+async def get_user_store_products(
+    user_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(None),
+):
     """Get all products in user's store with full details"""
     try:
-        logger.info(f"GET USER STORE PRODUCTS: user_id={user_id}")
+        logger.info("GET USER STORE PRODUCTS", extra={"user_id": user_id})
 
-        # Get all product_ids from user_store
-        user_store_entries = db.query(UserStore).filter(UserStore.user_id == user_id).all()
-        product_ids = [entry.product_id for entry in user_store_entries]
+        # ✅ Single key lookup on the materialized view; built on first read
+        view = await db.get(UserStoreView, user_id)
+        if view is None:
+            view = await db.run_sync(build_store_view, user_id)
 
-        if not product_ids:
-            return []
-
-        # Get full product details
-        products = (
-            db.query(ProductBasic)
-            .options(joinedload(ProductBasic.details))
-            .filter(ProductBasic.product_id.in_(product_ids))
-            .all()
-        )
+        etag = f'"{view.etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
 
-        result = []
-        for product in products:
-            if not product.details or len(product.details) == 0:
-                logger.error(f"Missing details for product_id={product.id}")
-                continue
-
-            try:
-                product_detail = product.details[0]
-                result.append(
-                    ProductOut(
-                        basic=ProductBasicOut.model_validate(product),
-                        details=ProductDetailsOut.model_validate(product_detail)
-                    )
-                )
-            except Exception as validation_error:
-                logger.error(f"Validation error for product {product.id}: {str(validation_error)}")
-                continue
-
-        logger.info(f"USER STORE PRODUCT COUNT: {len(result)}")
-        return result
+        logger.info("USER STORE PRODUCT COUNT", extra={"user_id": user_id, "count": view.product_count})
+        return Response(content=view.payload, media_type="application/json", headers=headers)
 
     except Exception as e:
-        logger.error(f"GET USER STORE PRODUCTS ERROR: {str(e)}", exc_info=True)
+        logger.error("GET USER STORE PRODUCTS ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
 
 @router.get("/products/{product_id}", response_model=ProductOut)
-def get_product(product_id: str, db: Session = Depends(get_db)):
+async def get_product(
+    product_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    cache_headers: dict = Depends(conditional_get(PRODUCTS)),
+):
     """Get full single product (basic + details)"""
     try:
-        product = (
-            db.query(ProductBasic)
-            .options(joinedload(ProductBasic.details))  # Load details table
-            .filter(ProductBasic.product_id == product_id)
-            .first()
-        )
+        # ✅ Served from the product cache after warm-up
+        payload = await db.run_sync(get_product_payload, product_id)
 
-        if not product:
+        if payload is None:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        if not product.details:
-            raise HTTPException(status_code=500, detail="Product details missing")
-
-        details = product.details[0]  # Assuming one-to-one relationship
-
-        return ProductOut(
-            basic=ProductBasicOut.model_validate(product),
-            details=ProductDetailsOut.model_validate(details),
-        )
+        return Response(content=payload, media_type="application/json", headers=cache_headers)
 
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
-        logger.error(f"GET PRODUCT ERROR: {str(e)}", exc_info=True)
+        logger.error("GET PRODUCT ERROR", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to load product: {str(e)}")
 
 @router.post("/create-store", response_model=StoreOut)
@@ -175,7 +234,7 @@ def create_store(data: StoreCreate, db: Session = Depends(get_db)):
     Create a new store
     """
     try:
-        logger.info(f"CREATE STORE: user_id={data.user_id}, store_code={data.store_code}")
+        logger.info("CREATE STORE", extra={"user_id": data.user_id, "store_code": data.store_code})
 
         # Check if store code already exists
         existing_store = db.query(Store).filter(
@@ -189,7 +248,7 @@ def create_store(data: StoreCreate, db: Session = Depends(get_db)):
             )
 
         store = Store(
-            store_id=str(uuid.uuid4()),
+            store_id=new_ulid(),  # time-ordered: appends to the primary key index
             store_name=data.store_name,
             user_id=data.user_id,
             username=data.username,
@@ -197,17 +256,22 @@ def create_store(data: StoreCreate, db: Session = Depends(get_db)):
         )
 
         db.add(store)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Same store_code created concurrently since the check above
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Store code already exists")
         db.refresh(store)
 
-        logger.info(f"STORE CREATED: store_id={store.store_id}")
+        logger.info("STORE CREATED", extra={"store_id": store.store_id})
         return store
 
     except HTTPException:
         raise
-    except Exception as e:
+    except Exception:
         db.rollback()
-        logger.error(f"CREATE STORE ERROR: {str(e)}", exc_info=True)
+        logger.error("CREATE STORE ERROR", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to create store"
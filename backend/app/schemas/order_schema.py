@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 class OrderCreate(BaseModel):
     product_id: str
@@ -13,4 +13,8 @@ class BillingDetailsCreate(BaseModel):
     address: str
     city: str
     zip_code: str = Field(..., alias="zipCode")
-    country: str
\ No newline at end of file
+    country: str
+
+class BatchOrderCreate(BaseModel):
+    items: List[OrderCreate] = Field(..., min_length=1, max_length=100)
+    billing_data: BillingDetailsCreate
@@ -1,10 +1,15 @@
 # app/schemas/user_store_schema.py
 from pydantic import BaseModel, Field
+from typing import List
 
 class UserStoreCreate(BaseModel):
     user_id: str
     product_id: str
 
+class UserStoreBulk(BaseModel):
+    user_id: str
+    product_ids: List[str] = Field(..., min_length=1, max_length=500)
+
 class UserStoreOut(BaseModel):
     id: int
     user_id: str
@@ -0,0 +1,48 @@
+# app/services/idempotency.py
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.order_model import IdempotencyRecord
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different endpoint"""
+
+
+def _expiry_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def get_stored_response(db: Session, key: str, endpoint: str) -> Optional[dict]:
+    record = db.get(IdempotencyRecord, key)
+    if record is None:
+        return None
+    if record.created_at is not None and record.created_at < _expiry_cutoff():
+        # Expired but not yet purged: the key is free again (deleted with the caller's commit)
+        db.delete(record)
+        db.flush()
+        return None
+    if record.endpoint != endpoint:
+        raise IdempotencyConflict("Idempotency-Key already used for a different request")
+    return record.response
+
+
+def save_response(db: Session, key: str, endpoint: str, response: dict) -> None:
+    """Stage the response in the caller's transaction (the PK rejects concurrent duplicates)"""
+    db.add(IdempotencyRecord(key=key, endpoint=endpoint, response=response))
+
+
+def purge_expired(db: Session, batch_size: int = 10000) -> int:
+    """Delete keys older than IDEMPOTENCY_KEY_TTL_HOURS in batches; returns the number removed"""
+    removed = 0
+    while True:
+        keys = db.execute(
+            select(IdempotencyRecord.key).where(IdempotencyRecord.created_at < _expiry_cutoff()).limit(batch_size)
+        ).scalars().all()
+        if not keys:
+            return removed
+        db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key.in_(keys)))
+        db.commit()
+        removed += len(keys)
@@ -0,0 +1,48 @@
+# app/services/job_handlers.py
+"""Background job handlers. Each stages its writes on `db`; the runner commits them
+together with the job's done-mark, so a handler's effects apply exactly once."""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.order_model import Order
+from app.config import settings
+from app.services.idempotency import purge_expired
+from app.services.jobs import enqueue, job_handler, periodic_task
+from app.services.points import compact_points
+from app.services.referral import stage_referral
+from app.services.referral_graph import apply_referral_stats, leaderboard
+from app.services.sales_analytics import record_sales
+
+REFERRAL_APPLY = "referral.apply"
+REFERRAL_STATS = "referral.stats"
+ORDERS_PLACED = "orders.placed"
+
+
+@job_handler(REFERRAL_APPLY)
+def apply_referral_job(db: Session, payload: dict):
+    delta = stage_referral(db, payload["referral_code"], payload["new_user_id"])
+    if delta:
+        enqueue(db, REFERRAL_STATS, delta, dedup_key=f"{REFERRAL_STATS}:{payload['new_user_id']}")
+
+
+@job_handler(REFERRAL_STATS)
+def apply_referral_stats_job(db: Session, payload: dict):
+    """Increment the ancestors' aggregates in their own short transaction"""
+    rows = apply_referral_stats(db, payload)
+    return lambda: leaderboard.apply(rows)
+
+
+@job_handler(ORDERS_PLACED)
+def orders_placed_job(db: Session, payload: dict):
+    """Post-checkout side effects: sales rollup now; points / notifications hook in here"""
+    orders = db.execute(select(Order).where(Order.id.in_(payload["order_ids"]))).scalars().all()
+    record_sales(db, orders, payload.get("country"))
+
+
+@periodic_task(settings.POINTS_COMPACTION_INTERVAL_SECONDS)
+def compact_points_task(db: Session):
+    compact_points(db)
+
+
+@periodic_task(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+def purge_idempotency_keys_task(db: Session):
+    purge_expired(db)
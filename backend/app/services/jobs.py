@@ -0,0 +1,245 @@
+# app/services/jobs.py
+import importlib
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db import SessionLocal
+from app.models.job_model import Job
+
+logger = logging.getLogger("jobs_logger")
+
+# kind -> handler(db, payload). Handlers stage their writes without committing; the runner
+# commits them together with the "done" mark, and may return a callback to run after commit.
+HANDLERS: dict[str, Callable] = {}
+HANDLER_MODULES = ("app.services.job_handlers",)
+
+# Periodic maintenance run by every worker loop: [interval seconds, fn(db), next due (monotonic)]
+PERIODIC: list[list] = []
+
+
+def job_handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def periodic_task(seconds: float):
+    def register(fn):
+        PERIODIC.append([seconds, fn, 0.0])
+        return fn
+    return register
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Enqueue: staged in the caller's transaction (no separate commit)
+# ------------------------------------------------------------------
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict,
+    dedup_key: Optional[str] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+) -> bool:
+    """Queue a job; returns False when a job with the same dedup_key already exists"""
+    job = Job(
+        kind=kind,
+        payload=payload,
+        dedup_key=dedup_key,
+        status="pending",
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    if dedup_key is None:
+        db.add(job)
+        return True
+    try:
+        with db.begin_nested():
+            db.add(job)
+        return True
+    except IntegrityError:
+        return False
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Claim / run / retry
+# ------------------------------------------------------------------
+def _lease_expired(now: datetime):
+    legacy = and_(Job.locked_until.is_(None), Job.locked_at < now - timedelta(seconds=settings.JOB_LEASE_SECONDS))
+    return and_(Job.status == "running", or_(Job.locked_until < now, legacy))
+
+
+def claim(db: Session, worker_id: str, limit: int) -> list[int]:
+    """Lease up to `limit` due jobs (conditional UPDATE, so no SKIP LOCKED needed).
+
+    Running jobs whose lease ran out (their worker died) are reclaimed here too;
+    one that already used its last attempt goes to the dead-letter "failed" state.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        update(Job)
+        .where(_lease_expired(now), Job.attempts >= Job.max_attempts)
+        .values(status="failed", finished_at=now, locked_by=None, locked_until=None,
+                last_error="Lease expired on the last attempt")
+    )
+    claimable = or_(and_(Job.status == "pending", Job.run_at <= now), _lease_expired(now))
+    candidates = db.execute(
+        select(Job.id).where(claimable).order_by(Job.run_at, Job.id).limit(limit)
+    ).scalars().all()
+
+    claimed = []
+    for job_id in candidates:
+        won = db.execute(
+            update(Job)
+            .where(Job.id == job_id, claimable)
+            .values(status="running", attempts=Job.attempts + 1, locked_by=worker_id, locked_at=now,
+                    locked_until=now + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+        ).rowcount
+        if won:
+            claimed.append(job_id)
+    db.commit()
+    return claimed
+
+
+def _backoff(attempts: int) -> float:
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def run_job(job_id: int, worker_id: str) -> bool:
+    """Run a job leased by `worker_id`; its outcome is only written while the lease is still held,
+    so a job reclaimed from a slow worker is never applied twice"""
+    held = and_(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        handler = HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            after_commit = handler(db, job.payload)
+            done = db.execute(
+                update(Job).where(held).values(
+                    status="done", finished_at=datetime.utcnow(), last_error=None, locked_until=None
+                )
+            ).rowcount
+            if not done:
+                db.rollback()
+                logger.warning("JOB LEASE LOST", extra={"job_id": job_id, "kind": job.kind, "worker": worker_id})
+                return False
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            job = db.get(Job, job_id)
+            error = f"{type(e).__name__}: {e}"[:2000]
+            if job.attempts >= job.max_attempts:
+                outcome = {"status": "failed", "finished_at": datetime.utcnow()}
+                logger.error("JOB FAILED", extra={"job_id": job_id, "kind": job.kind, "attempts": job.attempts}, exc_info=True)
+            else:
+                outcome = {"status": "pending", "run_at": datetime.utcnow() + timedelta(seconds=_backoff(job.attempts))}
+                logger.warning("JOB RETRY SCHEDULED", extra={"job_id": job_id, "kind": job.kind, "attempts": job.attempts, "error": str(e)})
+            db.execute(update(Job).where(held).values(last_error=error, locked_by=None, locked_until=None, **outcome))
+            db.commit()
+            return False
+    finally:
+        db.close()
+
+    if callable(after_commit):
+        try:
+            after_commit()
+        except Exception:
+            logger.error("JOB AFTER-COMMIT HOOK ERROR", extra={"job_id": job_id}, exc_info=True)
+    return True
+
+
+def maintain(db: Session) -> None:
+    """Drop finished jobs past retention (expired leases are reclaimed by claim)"""
+    db.execute(
+        delete(Job).where(
+            Job.status.in_(["done", "failed"]),
+            Job.finished_at < datetime.utcnow() - timedelta(hours=settings.JOB_RETENTION_HOURS),
+        )
+    )
+    db.commit()
+
+
+def job_stats(db: Session) -> dict:
+    counts = dict(db.execute(select(Job.status, func.count()).group_by(Job.status)).all())
+    oldest = db.execute(
+        select(func.min(Job.run_at)).where(Job.status == "pending", Job.run_at <= datetime.utcnow())
+    ).scalar()
+    return {
+        "counts": {status: counts.get(status, 0) for status in ("pending", "running", "done", "failed")},
+        "oldest_due_seconds": round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Worker loop (thread in the API process, or `python -m app.cli worker`)
+# ------------------------------------------------------------------
+def run_worker(stop: threading.Event, worker_id: Optional[str] = None) -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    logger.info("JOB WORKER STARTED", extra={"worker": worker_id})
+
+    next_maintenance = 0.0
+    while not stop.is_set():
+        try:
+            db = SessionLocal()
+            try:
+                if time.monotonic() >= next_maintenance:
+                    maintain(db)
+                    next_maintenance = time.monotonic() + settings.JOB_LEASE_SECONDS / 2
+                claimed = claim(db, worker_id, settings.JOB_BATCH_SIZE)
+            finally:
+                db.close()
+            _run_periodic()
+
+            for job_id in claimed:
+                run_job(job_id, worker_id)
+        except Exception:
+            logger.error("JOB WORKER ERROR", extra={"worker": worker_id}, exc_info=True)
+            claimed = []
+
+        if not claimed:
+            stop.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    logger.info("JOB WORKER STOPPED", extra={"worker": worker_id})
+
+
+def _run_periodic() -> None:
+    for task in PERIODIC:
+        interval, fn, due = task
+        if time.monotonic() < due:
+            continue
+        task[2] = time.monotonic() + interval
+        db = SessionLocal()
+        try:
+            fn(db)
+        except Exception:
+            db.rollback()
+            logger.error("PERIODIC TASK ERROR", extra={"task": fn.__name__}, exc_info=True)
+        finally:
+            db.close()
+
+
+def start_worker_threads(count: int) -> tuple[threading.Event, list[threading.Thread]]:
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=run_worker, args=(stop,), name=f"job-worker-{i}", daemon=True)
+        for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return stop, threads
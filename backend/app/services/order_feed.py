@@ -0,0 +1,124 @@
+# app/services/order_feed.py
+import base64
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from app.models.order_model import Order
+from app.models.product_model import ProductBasic, ProductDetails
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Keyset cursor: opaque token over (created_at, id)
+# ------------------------------------------------------------------
+def encode_cursor(created_at: datetime, order_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{order_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, order_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Serialize one order in the shape OrdersList.tsx / MyOrders.tsx expect
+# ------------------------------------------------------------------
+def serialize_order(order: Order, product: Optional[dict]) -> dict:
+    billing = order.billing_details
+    return {
+        "id": order.id,
+        "product_id": order.product_id,
+        "quantity": order.quantity,
+        "total_price": order.total_price,
+        "status": order.status,
+        "created_at": order.created_at,
+        "billing_details": {
+            "name": billing.name,
+            "email": billing.email,
+            "phone": billing.phone,
+            "address": billing.address,
+            "city": billing.city,
+            "zip_code": billing.zip_code,
+            "country": billing.country,
+        } if billing else None,
+        "product_details": product,
+    }
+
+
+def load_product_images(db: Session, product_ids: set) -> dict:
+    """Resolve {product_id: {"id", "images"}} for a set of product codes in one query"""
+    if not product_ids:
+        return {}
+
+    rows = (
+        db.query(ProductBasic.product_id, ProductBasic.id, ProductDetails.images)
+        .outerjoin(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .filter(ProductBasic.product_id.in_(product_ids))
+        .order_by(ProductBasic.id, ProductDetails.id)
+        .all()
+    )
+
+    products = {}
+    for product_id, pk, images in rows:
+        # Keep the first details row per product (one-to-one in practice)
+        products.setdefault(product_id, {"id": pk, "images": images})
+    return products
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Order feed: orders + billing + product images in 3 queries total
+# ------------------------------------------------------------------
+def fetch_order_feed(
+    db: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """Return (orders, next_cursor) newest first, using keyset pagination on (created_at, id)"""
+    query = db.query(Order).options(selectinload(Order.billing_details))
+
+    if status:
+        query = query.filter(Order.status == status)
+    if date_from:
+        query = query.filter(Order.created_at >= date_from)
+    if date_to:
+        query = query.filter(Order.created_at < date_to)
+    if cursor:
+        created_at, order_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Order.created_at < created_at,
+                and_(Order.created_at == created_at, Order.id < order_id),
+            )
+        )
+
+    query = query.order_by(Order.created_at.desc(), Order.id.desc())
+
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        orders = query.limit(limit + 1).all()
+        has_more = len(orders) > limit
+        orders = orders[:limit]
+    else:
+        orders = query.all()
+        has_more = False
+
+    products = load_product_images(db, {order.product_id for order in orders})
+    items = [serialize_order(order, products.get(order.product_id)) for order in orders]
+
+    next_cursor = None
+    if has_more and orders[-1].created_at is not None:
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+
+    return items, next_cursor
@@ -0,0 +1,129 @@
+# app/services/points.py
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.points_model import PointsLedger, PointsWatermark
+from app.models.user_model import User
+
+WATERMARK = "users.points"
+
+# Balances are read far more often than they change; local awards invalidate immediately
+balance_cache = LRUCache(maxsize=10000, ttl=settings.POINTS_BALANCE_CACHE_TTL_SECONDS)
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Awards: one INSERT per event, staged in the caller's transaction
+# ------------------------------------------------------------------
+def add_points(db: Session, user_id: int, delta: int, reason: str, ref_key: Optional[str] = None) -> bool:
+    """Append a ledger entry; returns False if an entry with this ref_key already exists"""
+    entry = PointsLedger(user_id=user_id, delta=delta, reason=reason, ref_key=ref_key)
+    if ref_key is None:
+        db.add(entry)
+    else:
+        try:
+            with db.begin_nested():
+                db.add(entry)
+        except IntegrityError:
+            return False
+    balance_cache.invalidate(user_id)
+    return True
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Balance: compacted users.points + the not-yet-compacted tail, in one statement
+# ------------------------------------------------------------------
+def get_balance(db: Session, user_id: int) -> Optional[int]:
+    cached = balance_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    watermark = select(PointsWatermark.last_id).where(PointsWatermark.name == WATERMARK).scalar_subquery()
+    tail = (
+        select(func.coalesce(func.sum(PointsLedger.delta), 0))
+        .where(PointsLedger.user_id == User.id, PointsLedger.id > func.coalesce(watermark, 0))
+        .scalar_subquery()
+    )
+    # A single statement reads users.points and the ledger from one snapshot
+    balance = db.execute(
+        select(func.coalesce(User.points, 0) + tail).where(User.id == user_id)
+    ).scalar()
+    if balance is None:
+        return None  # unknown user
+
+    balance = int(balance)
+    balance_cache.set(user_id, balance)
+    return balance
+
+
+def get_history(db: Session, user_id: int, limit: int = 20) -> list[dict]:
+    rows = db.execute(
+        select(PointsLedger)
+        .where(PointsLedger.user_id == user_id)
+        .order_by(PointsLedger.id.desc())
+        .limit(limit)
+    ).scalars()
+    return [
+        {"id": r.id, "delta": r.delta, "reason": r.reason, "created_at": r.created_at.isoformat()}
+        for r in rows
+    ]
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Compaction: fold old ledger rows into users.points in batches
+# ------------------------------------------------------------------
+def compact_points(db: Session, batch_size: int = 10000) -> dict:
+    """Move the watermark forward over ledger rows older than the lag.
+
+    The lag keeps rows from still-open transactions (which may hold lower ids)
+    above the watermark. Ids and created_at need not agree, so each batch stops
+    just below the first row still inside the lag, never past it.
+    """
+    watermark = db.execute(
+        select(PointsWatermark).where(PointsWatermark.name == WATERMARK).with_for_update()
+    ).scalar_one_or_none()
+    if watermark is None:
+        try:
+            with db.begin_nested():
+                watermark = PointsWatermark(name=WATERMARK, last_id=0)
+                db.add(watermark)
+        except IntegrityError:
+            db.rollback()
+            return {"compacted": 0, "users": 0}  # another compactor created it; run again later
+
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.POINTS_COMPACTION_LAG_SECONDS)
+    first_young = db.execute(
+        select(func.min(PointsLedger.id))
+        .where(PointsLedger.id > watermark.last_id, PointsLedger.created_at >= cutoff)
+    ).scalar()
+    batch = select(PointsLedger.id).where(PointsLedger.id > watermark.last_id)
+    if first_young is not None:
+        batch = batch.where(PointsLedger.id < first_young)
+    batch = (
+        batch.order_by(PointsLedger.id)
+        .limit(batch_size)
+        .subquery()
+    )
+    upto = db.execute(select(func.max(batch.c.id))).scalar()
+    if upto is None:
+        db.commit()
+        return {"compacted": 0, "users": 0}
+
+    totals = db.execute(
+        select(PointsLedger.user_id, func.sum(PointsLedger.delta), func.count())
+        .where(PointsLedger.id > watermark.last_id, PointsLedger.id <= upto)
+        .group_by(PointsLedger.user_id)
+    ).all()
+    db.execute(
+        update(User.__table__)
+        .where(User.__table__.c.id == bindparam("uid"))
+        .values(points=func.coalesce(User.__table__.c.points, 0) + bindparam("gain")),
+        [{"uid": user_id, "gain": int(gain)} for user_id, gain, _ in totals],
+    )
+    watermark.last_id = upto
+    watermark.updated_at = datetime.utcnow()
+    db.commit()
+    return {"compacted": sum(count for _, _, count in totals), "users": len(totals), "watermark": upto}
@@ -0,0 +1,333 @@
+# app/services/product_catalog.py
+import base64
+import json
+from typing import Iterator, Optional
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, joinedload
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.product_model import ProductBasic, ProductDetails
+from app.schemas.product_schema import ProductOut
+
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# Serialized ProductOut JSON bytes keyed by product_id, plus the full list under ALL_PRODUCTS_KEY
+product_cache = LRUCache(
+    maxsize=settings.PRODUCT_CACHE_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL_SECONDS,
+)
+ALL_PRODUCTS_KEY = "__all__"
+
+# Filtered total counts (X-Total-Count), short-lived and dropped on every product write
+count_cache = LRUCache(maxsize=1024, ttl=30)
+
+
+# ------------------------------------------------------------------
+# ✅ Trusted-output serialization: plain row tuples -> ProductOut-shaped JSON bytes
+# ------------------------------------------------------------------
+# Column order matches ProductBasicOut / ProductDetailsOut field order
+PRODUCT_COLUMNS = (
+    ProductBasic.id,
+    ProductBasic.product_id,
+    ProductBasic.category,
+    ProductBasic.name,
+    ProductBasic.type,
+    ProductDetails.id,
+    ProductDetails.products_id,
+    ProductDetails.description,
+    ProductDetails.features,
+    ProductDetails.specifications,
+    ProductDetails.images,
+    ProductDetails.price,
+    ProductDetails.actual_price,
+    ProductDetails.profit,
+    ProductDetails.margin,
+    ProductDetails.points,
+)
+
+
+def product_dict(
+    basic_id, product_id, category, name, type_,
+    details_id, products_id, description, features, specifications, images,
+    price, actual_price, profit, margin, points,
+) -> dict:
+    """Build the ProductOut JSON shape without Pydantic (columns are NOT NULL where the schema requires)"""
+    product = {
+        "basic": {
+            "id": basic_id,
+            "product_id": product_id,
+            "category": category,
+            "name": name,
+            "type": type_,
+        },
+        "details": {
+            "id": details_id,
+            "products_id": products_id,
+            "description": description,
+            "features": features,
+            "specifications": specifications,
+            "images": images,
+            "price": float(price),
+            "actual_price": float(actual_price),
+            "profit": float(profit),
+            "margin": float(margin),
+            "points": points,
+        },
+    }
+    if settings.VALIDATE_PRODUCT_PAYLOADS:
+        ProductOut.model_validate(product)
+    return product
+
+
+def encode_product_row(row) -> bytes:
+    """Encode one PRODUCT_COLUMNS row tuple"""
+    return dumps(product_dict(*row))
+
+
+# ------------------------------------------------------------------
+# ✅ Server-side batched scan of the catalogue (constant memory)
+# ------------------------------------------------------------------
+def iter_products(db: Session, batch_size: int = 500) -> Iterator[tuple[ProductBasic, ProductDetails]]:
+    """Yield (basic, details) pairs, reading rows from the DB in batches of batch_size"""
+    stmt = (
+        select(ProductBasic, ProductDetails)
+        .join(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .order_by(ProductBasic.id, ProductDetails.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    last_id = None
+    for basic, details in db.execute(stmt):
+        # Only the first details row per product is exposed (one-to-one in practice)
+        if basic.id == last_id:
+            continue
+        last_id = basic.id
+        yield basic, details
+
+
+def iter_product_rows(db: Session, batch_size: int = 500) -> Iterator[tuple]:
+    """Like iter_products, but yields plain PRODUCT_COLUMNS tuples (no ORM objects)"""
+    stmt = (
+        select(*PRODUCT_COLUMNS)
+        .join(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .order_by(ProductBasic.id, ProductDetails.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    last_id = None
+    for row in db.execute(stmt):
+        if row[0] == last_id:
+            continue
+        last_id = row[0]
+        yield row
+
+
+def iter_products_ndjson(db: Session, batch_size: int = 500) -> Iterator[bytes]:
+    """Yield NDJSON chunks of serialized ProductOut, one chunk per batch"""
+    chunk = []
+    for row in iter_product_rows(db, batch_size):
+        chunk.append(encode_product_row(row))
+        if len(chunk) >= batch_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+# ------------------------------------------------------------------
+# ✅ Cached reads: serialized ProductOut payloads (JSON bytes)
+# ------------------------------------------------------------------
+def serialize_product(basic: ProductBasic, details: ProductDetails) -> bytes:
+    return dumps(product_dict(
+        basic.id, basic.product_id, basic.category, basic.name, basic.type,
+        details.id, details.products_id, details.description, details.features,
+        details.specifications, details.images, details.price, details.actual_price,
+        details.profit, details.margin, details.points,
+    ))
+
+
+def list_product_payloads(db: Session) -> tuple[list[bytes], list[int]]:
+    """Serialize the whole catalogue from one tuple query; returns (payloads, ids missing details)"""
+    rows = db.execute(
+        select(*PRODUCT_COLUMNS)
+        .outerjoin(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .order_by(ProductBasic.id, ProductDetails.id)
+    ).all()
+
+    payloads, missing, last_id = [], [], None
+    for row in rows:
+        if row[0] == last_id:
+            continue
+        last_id = row[0]
+        if row[5] is None:
+            missing.append(row[0])
+            continue
+        payload = encode_product_row(row)
+        product_cache.set(row[1], payload)
+        payloads.append(payload)
+    return payloads, missing
+
+
+def get_product_payload(db: Session, product_id: str) -> Optional[bytes]:
+    """Return the serialized product, or None if it does not exist.
+
+    Raises LookupError when the product exists but has no details row.
+    """
+    payload = product_cache.get(product_id)
+    if payload is not None:
+        return payload
+
+    product = (
+        db.query(ProductBasic)
+        .options(joinedload(ProductBasic.details))
+        .filter(ProductBasic.product_id == product_id)
+        .first()
+    )
+    if not product:
+        return None
+    if not product.details:
+        raise LookupError("Product details missing")
+
+    payload = serialize_product(product, product.details[0])
+    product_cache.set(product_id, payload)
+    return payload
+
+
+def cache_product_list(payloads: list[bytes], etag: str) -> bytes:
+    """Cache the full list tagged with the products ETag read before it was queried"""
+    body = b"[" + b",".join(payloads) + b"]"
+    product_cache.set(ALL_PRODUCTS_KEY, (etag, body))
+    return body
+
+
+def cached_product_list(etag: str) -> Optional[bytes]:
+    """Cached full list, only if built at this ETag (another worker may have written since)"""
+    cached = product_cache.get(ALL_PRODUCTS_KEY)
+    if cached is None:
+        return None
+    cached_etag, body = cached
+    if cached_etag != etag:
+        product_cache.invalidate(ALL_PRODUCTS_KEY)
+        return None
+    return body
+
+
+def invalidate_product(product_id: str) -> None:
+    """Drop a product and the cached full list after a write"""
+    product_cache.invalidate(product_id, ALL_PRODUCTS_KEY)
+    count_cache.clear()
+
+
+# ------------------------------------------------------------------
+# ✅ Filtered, sorted keyset pages (backed by the product_basic/details indexes)
+# ------------------------------------------------------------------
+SORT_COLUMNS = {
+    "id": ProductBasic.id,
+    "price": ProductDetails.price,
+    "margin": ProductDetails.margin,
+    "points": ProductDetails.points,
+}
+
+
+# Position of each sort column in a PRODUCT_COLUMNS row
+SORT_ROW_INDEX = {"id": 0, "price": 11, "margin": 13, "points": 15}
+
+
+class InvalidProductCursor(ValueError):
+    pass
+
+
+def _encode_page_cursor(value, product_pk: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, product_pk]).encode()).decode()
+
+
+def _decode_page_cursor(cursor: str) -> tuple:
+    try:
+        value, product_pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(product_pk)
+    except Exception:
+        raise InvalidProductCursor("Invalid cursor")
+
+
+def _apply_filters(stmt, filters: dict):
+    if filters.get("category"):
+        stmt = stmt.where(ProductBasic.category == filters["category"])
+    if filters.get("type"):
+        stmt = stmt.where(ProductBasic.type == filters["type"])
+    if filters.get("min_price") is not None:
+        stmt = stmt.where(ProductDetails.price >= filters["min_price"])
+    if filters.get("max_price") is not None:
+        stmt = stmt.where(ProductDetails.price <= filters["max_price"])
+    if filters.get("min_points") is not None:
+        stmt = stmt.where(ProductDetails.points >= filters["min_points"])
+    if filters.get("max_points") is not None:
+        stmt = stmt.where(ProductDetails.points <= filters["max_points"])
+    return stmt
+
+
+def count_products(db: Session, filters: dict) -> int:
+    key = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+    total = count_cache.get(key)
+    if total is None:
+        stmt = _apply_filters(
+            select(func.count(ProductBasic.id))
+            .select_from(ProductBasic)
+            .join(ProductDetails, ProductDetails.products_id == ProductBasic.id),
+            filters,
+        )
+        total = db.execute(stmt).scalar_one()
+        count_cache.set(key, total)
+    return total
+
+
+def query_product_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    order: str = "asc",
+    **filters,
+) -> tuple[list[bytes], Optional[str]]:
+    """Return (serialized products, next_cursor) for one keyset page"""
+    sort_column = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    stmt = _apply_filters(
+        select(*PRODUCT_COLUMNS)
+        .join(ProductDetails, ProductDetails.products_id == ProductBasic.id),
+        filters,
+    )
+
+    if cursor:
+        value, last_pk = _decode_page_cursor(cursor)
+        if descending:
+            stmt = stmt.where(or_(sort_column < value, and_(sort_column == value, ProductBasic.id < last_pk)))
+        else:
+            stmt = stmt.where(or_(sort_column > value, and_(sort_column == value, ProductBasic.id > last_pk)))
+
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), ProductBasic.id.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), ProductBasic.id.asc())
+
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    payloads = [encode_product_row(row) for row in rows]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_page_cursor(last[SORT_ROW_INDEX[sort]], last[0])
+
+    return payloads, next_cursor
@@ -0,0 +1,216 @@
+# app/services/product_import.py
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import IO, Iterable, Iterator, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.http_cache import PRODUCTS, bump_version
+from app.core.utils import generate_product_id
+from app.models.product_model import ProductBasic, ProductDetails
+from app.schemas.product_schema import ProductCreate
+from app.services.product_catalog import product_cache, count_cache
+from app.services.product_search import search_index
+
+MAX_REPORTED_ERRORS = 1000
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Shared cleaning rules (also used by POST /admin/products)
+# ------------------------------------------------------------------
+def clean_product_lists(product: ProductCreate) -> dict:
+    """Drop empty specifications/features/images; empty lists become None"""
+    specifications_list = [
+        {"label": spec.label, "value": spec.value}
+        for spec in product.specifications or []
+        if spec.label and spec.value and spec.label.strip() and spec.value.strip()
+    ]
+    features_list = [f.strip() for f in product.features or [] if f and f.strip()]
+
+    return {
+        "specifications": specifications_list or None,
+        "features": features_list or None,
+        "images": product.images or None,
+    }
+
+
+def compute_profit_margin(prices: list[float], actual_prices: list[float]) -> tuple[list[float], list[float]]:
+    """Column-wise profit and margin (%) for a whole batch"""
+    profits = [price - actual for price, actual in zip(prices, actual_prices)]
+    margins = [
+        (profit / actual * 100) if actual > 0 else 0
+        for profit, actual in zip(profits, actual_prices)
+    ]
+    return profits, margins
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Record readers (CSV / NDJSON) -> (row number, raw dict)
+# ------------------------------------------------------------------
+def _split_list(value: Optional[str]):
+    """CSV list cells accept a JSON array or a '|' separated string"""
+    if value is None or not value.strip():
+        return []
+    value = value.strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [part.strip() for part in value.split("|")]
+
+
+def read_csv_records(stream: IO[str]) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(stream)
+    for row_number, row in enumerate(reader, start=1):
+        try:
+            record = {k: v for k, v in row.items() if k and v not in (None, "")}
+            for key in ("features", "images", "specifications"):
+                if key in record:
+                    record[key] = _split_list(record[key])
+            yield row_number, record
+        except ValueError as e:
+            yield row_number, {"__error__": f"Invalid list cell: {str(e)}"}
+
+
+def read_ndjson_records(stream: IO[str]) -> Iterator[tuple[int, dict]]:
+    for row_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, {"__error__": f"Invalid JSON: {str(e)}"}
+
+
+def read_records(stream: IO[bytes], fmt: str) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        return read_csv_records(text)
+    return read_ndjson_records(text)
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Batched import
+# ------------------------------------------------------------------
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": round(self.imported / self.seconds, 1) if self.seconds else 0.0,
+        }
+
+
+def _insert_batch(db: Session, products: list[ProductCreate]) -> list[tuple]:
+    """Multi-row insert of one validated batch: 2 INSERTs + 1 SELECT, one commit.
+
+    Returns (basic, details) pairs for the search index.
+    """
+    product_ids = [generate_product_id() for _ in products]
+    profits, margins = compute_profit_margin(
+        [p.price for p in products], [p.actual_price for p in products]
+    )
+
+    db.execute(insert(ProductBasic), [
+        {"product_id": pid, "category": p.category, "name": p.name, "type": p.type}
+        for pid, p in zip(product_ids, products)
+    ])
+
+    # MySQL has no INSERT ... RETURNING, so resolve the new PKs in one query
+    pks = dict(db.execute(
+        select(ProductBasic.product_id, ProductBasic.id).where(ProductBasic.product_id.in_(product_ids))
+    ).all())
+
+    detail_rows = [
+        {
+            "products_id": pks[pid],
+            "description": p.description,
+            **clean_product_lists(p),
+            "price": p.price,
+            "actual_price": p.actual_price,
+            "profit": profit,
+            "margin": margin,
+            "points": p.points,
+        }
+        for pid, p, profit, margin in zip(product_ids, products, profits, margins)
+    ]
+    db.execute(insert(ProductDetails), detail_rows)
+    db.commit()
+
+    return [
+        (SimpleNamespace(id=pks[pid], product_id=pid, name=p.name, category=p.category, type=p.type),
+         SimpleNamespace(**details))
+        for pid, p, details in zip(product_ids, products, detail_rows)
+    ]
+
+
+def import_products(db: Session, records: Iterable[tuple[int, dict]], batch_size: int = 1000) -> ImportReport:
+    """Validate and insert records in batches; invalid rows are reported, not fatal"""
+    report = ImportReport()
+    started = time.perf_counter()
+    batch: list[tuple[int, ProductCreate]] = []
+
+    def flush():
+        if not batch:
+            return
+        inserted = []
+        try:
+            inserted = _insert_batch(db, [product for _, product in batch])
+        except Exception:
+            # ✅ Retry the failed batch row by row so only the offending rows are reported
+            db.rollback()
+            for row, product in batch:
+                try:
+                    inserted += _insert_batch(db, [product])
+                except Exception as e:
+                    db.rollback()
+                    report.add_error(row, f"Insert failed: {getattr(e, 'orig', e)}")
+        batch.clear()
+        if not inserted:
+            return
+
+        report.imported += len(inserted)
+        version = bump_version(PRODUCTS)[PRODUCTS]  # once per committed batch, after the commit
+        search_index.apply_local_write(inserted, version)
+
+    for row, record in records:
+        report.total += 1
+        if "__error__" in record:
+            report.add_error(row, record["__error__"])
+            continue
+        try:
+            batch.append((row, ProductCreate.model_validate(record)))
+        except ValidationError as e:
+            report.add_error(row, "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+
+    if report.imported:
+        product_cache.clear()
+        count_cache.clear()
+
+    report.seconds = time.perf_counter() - started
+    return report
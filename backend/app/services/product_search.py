@@ -0,0 +1,202 @@
+# app/services/product_search.py
+import bisect
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.http_cache import PRODUCTS, version_etag
+from app.models.product_model import ProductBasic, ProductDetails
+from app.services.product_catalog import iter_products
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Field weights used for ranking
+NAME_WEIGHT = 3.0
+FEATURES_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class ProductSearchIndex:
+    """In-memory inverted index over product name, description and features.
+
+    term -> {product pk: weighted term frequency}; a sorted term list gives
+    prefix lookups via bisect. Per worker process, like the product cache;
+    refresh() rebuilds it when another worker has changed the products.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._terms: list[str] = []  # sorted
+        self._docs: dict[int, dict] = {}
+        self._doc_terms: dict[int, list[str]] = {}
+        self._refresh_lock = threading.Lock()
+        self.version: Optional[str] = None  # products ETag the index was built at
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    def add(self, basic: ProductBasic, details: Optional[ProductDetails]) -> None:
+        with self._lock:
+            self.remove(basic.id)
+            for term in self._index(basic, details):
+                i = bisect.bisect_left(self._terms, term)
+                if i == len(self._terms) or self._terms[i] != term:
+                    self._terms.insert(i, term)
+
+    def _index(self, basic: ProductBasic, details: Optional[ProductDetails]) -> list[str]:
+        """Write the product's postings and doc; returns its terms (callers maintain _terms)"""
+        weights = Counter()
+        for token in tokenize(basic.name):
+            weights[token] += NAME_WEIGHT
+        if details is not None:
+            for feature in details.features or []:
+                for token in tokenize(feature):
+                    weights[token] += FEATURES_WEIGHT
+            for token in tokenize(details.description):
+                weights[token] += DESCRIPTION_WEIGHT
+
+        for term, weight in weights.items():
+            self._postings[term][basic.id] = weight
+
+        self._doc_terms[basic.id] = list(weights)
+        self._docs[basic.id] = {
+            "id": basic.id,
+            "product_id": basic.product_id,
+            "name": basic.name,
+            "category": basic.category,
+            "type": basic.type,
+        }
+        return self._doc_terms[basic.id]
+
+    def remove(self, product_pk: int) -> None:
+        with self._lock:
+            for term in self._doc_terms.pop(product_pk, []):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(product_pk, None)
+                if not postings:
+                    del self._postings[term]
+                    i = bisect.bisect_left(self._terms, term)
+                    if i < len(self._terms) and self._terms[i] == term:
+                        del self._terms[i]
+            self._docs.pop(product_pk, None)
+
+    def rebuild(self, db: Session, version: Optional[str] = None) -> int:
+        """Bulk (re)build from the database; returns the number of indexed products.
+
+        version is the products ETag read before the rebuild started.
+        """
+        fresh = ProductSearchIndex()
+        for basic, details in iter_products(db):
+            fresh._index(basic, details)
+        fresh._terms = sorted(fresh._postings)  # one sort instead of an insort per term
+
+        with self._lock:
+            self._postings = fresh._postings
+            self._terms = fresh._terms
+            self._docs = fresh._docs
+            self._doc_terms = fresh._doc_terms
+            self.version = version
+        return len(fresh)
+
+    def apply_local_write(self, products: list[tuple], version: int) -> None:
+        """Index (basic, details) pairs this worker just committed; `version` is the products
+        version its bump_version returned.
+
+        The index only moves to that version if it was at the one before, i.e. no
+        other worker wrote in between; otherwise the next search still rebuilds.
+        """
+        with self._lock:
+            for basic, details in products:
+                self.add(basic, details)
+            if self.version == version_etag({PRODUCTS: version - 1}, PRODUCTS):
+                self.version = version_etag({PRODUCTS: version}, PRODUCTS)
+
+    def refresh(self, db: Session, version: str) -> bool:
+        """Rebuild when the products version moved (e.g. a write on another worker).
+
+        Only one thread rebuilds; concurrent searches keep reading the current index.
+        """
+        if version == self.version or not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            if version != self.version:
+                self.rebuild(db, version)
+        finally:
+            self._refresh_lock.release()
+        return True
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def _expand(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff")
+        return self._terms[start:end]
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        type: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict:
+        """Every query token must prefix-match a term (AND); results ranked by weighted tf-idf"""
+        tokens = tokenize(query)
+
+        with self._lock:
+            total_docs = len(self._docs) or 1
+            scores: Optional[dict[int, float]] = None
+
+            for token in tokens:
+                token_scores = defaultdict(float)
+                for term in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_docs / len(postings))
+                    # Exact matches rank above prefix-only matches
+                    boost = 1.0 if term == token else 0.5
+                    for pk, weight in postings.items():
+                        token_scores[pk] += weight * idf * boost
+
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {pk: s + token_scores[pk] for pk, s in scores.items() if pk in token_scores}
+                if not scores:
+                    break
+
+            matched = [self._docs[pk] for pk in (scores or {})]
+
+            # Facets are computed before the category/type filters narrow the hits
+            facets = {
+                "category": dict(Counter(doc["category"] for doc in matched)),
+                "type": dict(Counter(doc["type"] for doc in matched)),
+            }
+
+            if category:
+                matched = [doc for doc in matched if doc["category"] == category]
+            if type:
+                matched = [doc for doc in matched if doc["type"] == type]
+
+            matched.sort(key=lambda doc: (-scores[doc["id"]], doc["id"]))
+            page = [
+                dict(doc, score=round(scores[doc["id"]], 4))
+                for doc in matched[offset:offset + limit]
+            ]
+
+        return {"total": len(matched), "results": page, "facets": facets}
+
+
+search_index = ProductSearchIndex()
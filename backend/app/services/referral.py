@@ -1,30 +1,36 @@
 # app/utils/referral.py
-import random
-import string
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.ids import short_code
 from app.models.user_model import User
 from app.models.referral_model import Referral
+from app.services.points import add_points
+from app.services.referral_graph import REFERRAL_POINTS, record_referral
 
 # ------------------------------------------------------------------
 # ✅ 1. Generate Referral Code
 # ------------------------------------------------------------------
-def generate_referral_code(username: str) -> str:
-    suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-    return f"{username[:3].upper()}{suffix}"
+def generate_referral_code(username: str, length: int = 4) -> str:
+    """Name prefix + random suffix; uniqueness is enforced on insert (see insert_with_unique_code)"""
+    return short_code(length, prefix=username[:3].upper())
 
 
 # ------------------------------------------------------------------
 # ✅ 2. Apply Referral: assign points + create referral record
 # ------------------------------------------------------------------
-def apply_referral(db: Session, referrer_code: str, new_user_id: int):
+def stage_referral(db: Session, referrer_code: str, new_user_id: int) -> Optional[dict]:
+    """Stage the reward without committing; returns the referral stats delta to apply"""
+    # ✅ Idempotent: a retried job must not reward the same sign-up twice
+    if db.query(Referral.id).filter(Referral.new_user_id == new_user_id).first():
+        return None
+
     referrer = db.query(User).filter(User.referral_code == referrer_code).first()
 
     if not referrer:
-        return  # invalid code: do nothing
+        return None  # invalid code: do nothing
 
-    # ✅ Add 10 points to referrer
-    referrer.points += 10
-    db.add(referrer)
+    # ✅ Add 10 points to referrer: a ledger INSERT, not a read-modify-write of users.points
+    add_points(db, referrer.id, REFERRAL_POINTS, "referral", ref_key=f"referral:{new_user_id}")
 
     # ✅ Create referral record
     referral_record = Referral(
@@ -33,4 +39,5 @@ def apply_referral(db: Session, referrer_code: str, new_user_id: int):
     )
     db.add(referral_record)
 
-    db.commit()
+    # ✅ Closure rows only; the aggregates are incremented by a follow-up job (no hot-row UPDATEs here)
+    return record_referral(db, referrer.id, new_user_id)
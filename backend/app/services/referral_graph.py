@@ -0,0 +1,239 @@
+# app/services/referral_graph.py
+import bisect
+import threading
+from collections import defaultdict
+from sqlalchemy import Integer, bindparam, case, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.referral_model import Referral, ReferralPath, ReferralStats
+from app.models.user_model import User
+
+REFERRAL_POINTS = 10
+
+LEADERBOARD_METRICS = {
+    "points": ReferralStats.points_earned,
+    "direct": ReferralStats.direct_count,
+    "downstream": ReferralStats.downstream_count,
+}
+STATS_FIELDS = ("level", "direct_count", "downstream_count", "max_depth", "points_earned")
+
+
+def _stats_dict(user_id: int, stats) -> dict:
+    if stats is None:
+        return {"user_id": user_id, **{field: 0 for field in STATS_FIELDS}}
+    return {"user_id": user_id, **{field: getattr(stats, field) for field in STATS_FIELDS}}
+
+
+def _ensure_stats(db: Session, user_id: int) -> None:
+    if db.get(ReferralStats, user_id) is not None:
+        return
+    try:
+        with db.begin_nested():
+            db.add(ReferralStats(user_id=user_id))
+    except IntegrityError:
+        pass  # created concurrently
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Incremental update: closure rows are pure INSERTs in the referral transaction;
+#       ancestors' aggregates get bounded delta UPDATEs from a separate job
+# ------------------------------------------------------------------
+def record_referral(db: Session, referrer_id: int, new_user_id: int) -> dict:
+    """Link the new user (and anyone it already referred) under the referrer in the closure table;
+    returns the stats delta for apply_referral_stats.
+
+    Referral jobs may run in any order: if the new user's own referrals were
+    linked first, its subtree moves under the referrer's ancestors here too.
+    Pairs already present are skipped. No referral_stats row is touched, so
+    concurrent sign-ups under the same referrer don't queue on its row lock.
+    """
+    # Locking reads of just these two users' rows: a concurrent link touching the same user
+    # waits (or deadlocks and retries) instead of missing this one's paths
+    ancestors = [(referrer_id, 0), *db.execute(
+        select(ReferralPath.ancestor_id, ReferralPath.depth)
+        .where(ReferralPath.descendant_id == referrer_id)
+        .with_for_update(read=True)
+    ).all()]
+    subtree = [(new_user_id, 0), *db.execute(
+        select(ReferralPath.descendant_id, ReferralPath.depth)
+        .where(ReferralPath.ancestor_id == new_user_id)
+        .with_for_update(read=True)
+    ).all()]
+
+    existing = set(db.execute(
+        select(ReferralPath.ancestor_id, ReferralPath.descendant_id).where(
+            ReferralPath.ancestor_id.in_([a for a, _ in ancestors]),
+            ReferralPath.descendant_id.in_([d for d, _ in subtree]),
+        )
+    ).all())
+    paths = [
+        {"ancestor_id": a, "descendant_id": d, "depth": above + 1 + below}
+        for a, above in ancestors for d, below in subtree
+        if (a, d) not in existing
+    ]
+    if paths:
+        db.execute(insert(ReferralPath), paths)
+
+    return {
+        "referrer_id": referrer_id,
+        "ancestors": [[a, above + 1] for a, above in ancestors],  # depth of the new user below each ancestor
+        "subtree": [[d, below] for d, below in subtree],  # users joining the tree, with their depth below the new user
+    }
+
+
+def apply_referral_stats(db: Session, delta: dict) -> list[dict]:
+    """Stage one referral's increments: one keyed UPDATE per ancestor, no subtree scans.
+
+    Not idempotent on its own; the job runner commits it with the job's done-mark,
+    so it applies exactly once per referral.
+    """
+    ancestors = sorted(delta["ancestors"])  # key order, so concurrent jobs lock rows alike
+    subtree = sorted(delta["subtree"])
+    size, height = len(subtree), max(depth for _, depth in subtree)
+    user_ids = sorted({user_id for user_id, _ in ancestors + subtree})
+    for user_id in user_ids:
+        _ensure_stats(db, user_id)
+
+    stats = ReferralStats.__table__
+    reach = bindparam("depth", type_=Integer) + height
+    db.execute(
+        update(stats)
+        .where(stats.c.user_id == bindparam("uid"))
+        .values(
+            downstream_count=stats.c.downstream_count + size,
+            max_depth=case((stats.c.max_depth < reach, reach), else_=stats.c.max_depth),
+        ),
+        [{"uid": user_id, "depth": depth} for user_id, depth in ancestors],
+    )
+    db.execute(
+        update(stats)
+        .where(stats.c.user_id == delta["referrer_id"])
+        .values(direct_count=stats.c.direct_count + 1, points_earned=stats.c.points_earned + REFERRAL_POINTS)
+    )
+    # Users joining the tree move down by the number of ancestors above the new user
+    db.execute(
+        update(stats)
+        .where(stats.c.user_id.in_([user_id for user_id, _ in subtree]))
+        .values(level=stats.c.level + len(ancestors))
+    )
+
+    rows = db.execute(
+        select(ReferralStats, User.username)
+        .join(User, User.id == ReferralStats.user_id)
+        .where(ReferralStats.user_id.in_(user_ids))
+    ).all()
+    return [dict(_stats_dict(s.user_id, s), username=username) for s, username in rows]
+
+
+def get_referral_stats(db: Session, user_id: int) -> dict:
+    """Single primary-key lookup; users who never referred anyone read as zeros"""
+    return _stats_dict(user_id, db.get(ReferralStats, user_id))
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Leaderboards: top-N kept sorted in memory, reloaded from the index after a TTL
+# ------------------------------------------------------------------
+class _Board:
+    """Top `size` users for one metric, sorted by (score desc, user_id asc)"""
+
+    def __init__(self, size: int, rows: list[dict], metric: str):
+        self.size = size
+        self.metric = metric
+        self._keys = []    # (-score, user_id), kept sorted
+        self._rows = {}    # user_id -> row
+        for row in rows:
+            self.offer(row)
+
+    def offer(self, row: dict) -> None:
+        user_id, score = row["user_id"], row[self.metric]
+        previous = self._rows.pop(user_id, None)
+        if previous is not None:
+            del self._keys[bisect.bisect_left(self._keys, (-previous[self.metric], user_id))]
+
+        key = (-score, user_id)
+        if len(self._keys) >= self.size and key > self._keys[-1]:
+            return  # below the cut-off
+        bisect.insort(self._keys, key)
+        self._rows[user_id] = row
+        if len(self._keys) > self.size:
+            _, dropped = self._keys.pop()
+            del self._rows[dropped]
+
+    def top(self, limit: int) -> list[dict]:
+        return [self._rows[user_id] for _, user_id in self._keys[:limit]]
+
+
+class Leaderboard:
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self._boards = LRUCache(maxsize=len(LEADERBOARD_METRICS), ttl=ttl)
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, by: str) -> _Board:
+        column = LEADERBOARD_METRICS[by]
+        rows = db.execute(
+            select(ReferralStats, User.username)
+            .join(User, User.id == ReferralStats.user_id)
+            .where(column > 0)
+            .order_by(column.desc(), ReferralStats.user_id)
+            .limit(self.size)
+        ).all()
+        field = column.key
+        board = _Board(self.size, [dict(_stats_dict(s.user_id, s), username=u) for s, u in rows], field)
+        self._boards.set(by, board)
+        return board
+
+    def top(self, db: Session, by: str, limit: int) -> list[dict]:
+        with self._lock:
+            board = self._boards.get(by) or self._load(db, by)
+            return board.top(limit)
+
+    def apply(self, rows: list[dict]) -> None:
+        """Push freshly committed stats into any loaded boards"""
+        with self._lock:
+            for by in LEADERBOARD_METRICS:
+                board = self._boards.get(by)
+                if board is not None:
+                    for row in rows:
+                        board.offer(row)
+
+    def clear(self) -> None:
+        self._boards.clear()
+
+
+leaderboard = Leaderboard(size=settings.REFERRAL_LEADERBOARD_SIZE, ttl=settings.REFERRAL_LEADERBOARD_TTL_SECONDS)
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Full rebuild from the referrals table (backfill / repair)
+# ------------------------------------------------------------------
+def rebuild_referral_stats(db: Session, batch_size: int = 5000) -> dict:
+    parent = dict(db.execute(select(Referral.new_user_id, Referral.referrer_id).order_by(Referral.id)).all())
+
+    paths = []
+    stats = defaultdict(lambda: {"level": 0, "direct_count": 0, "downstream_count": 0, "max_depth": 0, "points_earned": 0})
+    for user_id, referrer_id in parent.items():
+        stats[referrer_id]["direct_count"] += 1
+        stats[referrer_id]["points_earned"] += REFERRAL_POINTS
+
+        ancestor, depth, seen = referrer_id, 1, {user_id}
+        while ancestor is not None and ancestor not in seen:  # guard against cycles in bad data
+            seen.add(ancestor)
+            paths.append({"ancestor_id": ancestor, "descendant_id": user_id, "depth": depth})
+            stats[ancestor]["downstream_count"] += 1
+            stats[ancestor]["max_depth"] = max(stats[ancestor]["max_depth"], depth)
+            ancestor, depth = parent.get(ancestor), depth + 1
+        stats[user_id]["level"] = depth - 1
+
+    db.execute(delete(ReferralPath))
+    db.execute(delete(ReferralStats))
+    for start in range(0, len(paths), batch_size):
+        db.execute(insert(ReferralPath), paths[start:start + batch_size])
+    stat_rows = [{"user_id": user_id, **values} for user_id, values in stats.items()]
+    for start in range(0, len(stat_rows), batch_size):
+        db.execute(insert(ReferralStats), stat_rows[start:start + batch_size])
+    db.commit()
+    leaderboard.clear()
+    return {"users": len(stat_rows), "paths": len(paths), "referrals": len(parent)}
@@ -0,0 +1,196 @@
+# app/services/sales_analytics.py
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.analytics_model import SalesRollup
+from app.models.order_model import BillingDetails, Order
+from app.models.product_model import ProductBasic, ProductDetails
+
+UNKNOWN_COUNTRY = "unknown"
+GROUP_BY = ("product", "category", "day", "week", "country")
+MEASURES = ("orders", "units", "revenue", "cost", "profit")
+
+# Reports are cheap but dashboards poll; local order writes clear this immediately
+analytics_cache = LRUCache(maxsize=256, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+
+
+def _country(value: Optional[str]) -> str:
+    return (value or "").strip()[:100] or UNKNOWN_COUNTRY
+
+
+def _as_date(value) -> date:
+    # func.date() comes back as a string on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def unit_economics(db: Session, product_ids: Iterable[str]) -> dict[str, tuple[float, float]]:
+    """product code -> (profit per unit, cost per unit) from the product's first details row"""
+    product_ids = set(product_ids)
+    if not product_ids:
+        return {}
+    rows = db.execute(
+        select(ProductBasic.product_id, ProductDetails.profit, ProductDetails.actual_price)
+        .join(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .where(ProductBasic.product_id.in_(product_ids))
+        .order_by(ProductDetails.id.desc())
+    ).all()
+    # Descending id: the first details row wins when a product has several
+    return {code: (profit or 0.0, cost or 0.0) for code, profit, cost in rows}
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Writers: fold new orders into the daily rollup, in the order's transaction
+# ------------------------------------------------------------------
+def _bump(db: Session, key: tuple, delta: dict) -> None:
+    day, product_id, country = key
+    stmt = (
+        update(SalesRollup)
+        .where(SalesRollup.day == day, SalesRollup.product_id == product_id, SalesRollup.country == country)
+        .values(**{m: getattr(SalesRollup, m) + delta[m] for m in MEASURES})
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(stmt).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.add(SalesRollup(day=day, product_id=product_id, country=country, **delta))
+    except IntegrityError:
+        db.execute(stmt)  # created concurrently
+
+
+def record_sales(db: Session, orders: Iterable[Order], country: Optional[str]) -> None:
+    orders = list(orders)
+    economics = unit_economics(db, (o.product_id for o in orders))
+    country = _country(country)
+
+    deltas = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for order in orders:
+        profit, cost = economics.get(order.product_id, (0.0, 0.0))
+        delta = deltas[(order.created_at.date(), order.product_id, country)]
+        delta["orders"] += 1
+        delta["units"] += order.quantity
+        delta["revenue"] += order.total_price
+        delta["cost"] += cost * order.quantity
+        delta["profit"] += profit * order.quantity
+
+    for key, delta in deltas.items():
+        _bump(db, key, delta)
+    analytics_cache.clear()
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Readers: group the rollup (days x products x countries), never orders
+# ------------------------------------------------------------------
+def _finish(row: dict) -> dict:
+    for m in ("revenue", "cost", "profit"):
+        row[m] = round(row[m], 2)
+    row["margin"] = round(row["profit"] / row["cost"] * 100, 2) if row["cost"] else 0.0
+    row["avg_order_value"] = round(row["revenue"] / row["orders"], 2) if row["orders"] else 0.0
+    return row
+
+
+def sales_report(
+    db: Session,
+    group_by: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 100,
+) -> dict:
+    cache_key = (group_by, date_from, date_to, country, category, limit)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    dimension = {
+        "product": SalesRollup.product_id,
+        "category": ProductBasic.category,
+        "day": SalesRollup.day,
+        "week": SalesRollup.day,
+        "country": SalesRollup.country,
+    }[group_by]
+    sums = [func.sum(getattr(SalesRollup, m)).label(m) for m in MEASURES]
+
+    stmt = select(dimension, *sums).group_by(dimension)
+    if group_by == "category" or category:
+        stmt = stmt.join(ProductBasic, ProductBasic.product_id == SalesRollup.product_id)
+    if date_from:
+        stmt = stmt.where(SalesRollup.day >= date_from)
+    if date_to:
+        stmt = stmt.where(SalesRollup.day <= date_to)
+    if country:
+        stmt = stmt.where(SalesRollup.country == country)
+    if category:
+        stmt = stmt.where(ProductBasic.category == category)
+
+    groups = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for key, *values in db.execute(stmt).all():
+        if group_by == "week":
+            key = _as_date(key)
+            key = key - timedelta(days=key.weekday())  # ISO week, keyed by its Monday
+        elif group_by == "day":
+            key = _as_date(key)
+        for m, value in zip(MEASURES, values):
+            groups[key][m] += value or 0
+
+    totals = _finish({m: sum(g[m] for g in groups.values()) for m in MEASURES})
+    if group_by in ("day", "week"):
+        ordered = sorted(groups.items())
+    else:
+        ordered = sorted(groups.items(), key=lambda item: item[1]["revenue"], reverse=True)
+
+    rows = [_finish(dict(measures, key=key.isoformat() if isinstance(key, date) else key)) for key, measures in ordered[:limit]]
+    if group_by == "product" and rows:
+        names = dict(db.execute(
+            select(ProductBasic.product_id, ProductBasic.name)
+            .where(ProductBasic.product_id.in_([row["key"] for row in rows]))
+        ).all())
+        for row in rows:
+            row["name"] = names.get(row["key"])
+
+    report = {"group_by": group_by, "groups": len(groups), "totals": totals, "rows": rows}
+    analytics_cache.set(cache_key, report)
+    return report
+
+
+# ------------------------------------------------------------------
+# ✅ 3. Full rebuild from orders (backfill / repair)
+# ------------------------------------------------------------------
+def rebuild_sales_rollups(db: Session, batch_size: int = 5000) -> dict:
+    day = func.date(Order.created_at)
+    grouped = db.execute(
+        select(
+            day, Order.product_id, BillingDetails.country,
+            func.count(Order.id), func.sum(Order.quantity), func.sum(Order.total_price),
+        )
+        .outerjoin(BillingDetails, BillingDetails.order_id == Order.id)
+        .group_by(day, Order.product_id, BillingDetails.country)
+    ).all()
+    economics = unit_economics(db, {row[1] for row in grouped})
+
+    rollups = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for order_day, product_id, country, orders, units, revenue in grouped:
+        profit, cost = economics.get(product_id, (0.0, 0.0))
+        row = rollups[(_as_date(order_day), product_id, _country(country))]
+        row["orders"] += orders
+        row["units"] += units or 0
+        row["revenue"] += revenue or 0.0
+        row["cost"] += cost * (units or 0)
+        row["profit"] += profit * (units or 0)
+
+    db.query(SalesRollup).delete()
+    rows = [
+        dict(values, day=key[0], product_id=key[1], country=key[2])
+        for key, values in rollups.items()
+    ]
+    for start in range(0, len(rows), batch_size):
+        db.bulk_insert_mappings(SalesRollup, rows[start:start + batch_size])
+    db.commit()
+    analytics_cache.clear()
+    return {"rollup_rows": len(rows), "orders": sum(r["orders"] for r in rows)}
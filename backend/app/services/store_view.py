@@ -0,0 +1,112 @@
+# app/services/store_view.py
+import hashlib
+import json
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.product_model import ProductBasic, ProductDetails
+from app.models.user_store_model import UserStore, UserStoreView
+from app.services.product_catalog import serialize_product
+
+
+def _etag(payload: str) -> str:
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _load_products(db: Session, product_ids: Iterable[str]) -> list[dict]:
+    """Serialized ProductOut dicts for the given product codes (first details row each)"""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return []
+
+    rows = db.execute(
+        select(ProductBasic, ProductDetails)
+        .join(ProductDetails, ProductDetails.products_id == ProductBasic.id)
+        .where(ProductBasic.product_id.in_(product_ids))
+        .order_by(ProductBasic.id, ProductDetails.id)
+    ).all()
+
+    products = {}
+    for basic, details in rows:
+        if basic.product_id not in products:
+            products[basic.product_id] = json.loads(serialize_product(basic, details))
+    return [products[pid] for pid in product_ids if pid in products]
+
+
+def _save(db: Session, view: UserStoreView, products: list[dict]) -> UserStoreView:
+    view.payload = json.dumps(products, separators=(",", ":"))
+    view.etag = _etag(view.payload)
+    view.product_count = len(products)
+    return view
+
+
+def _lock_view(db: Session, user_id: str):
+    return db.execute(
+        select(UserStoreView).where(UserStoreView.user_id == user_id).with_for_update()
+    ).scalar_one_or_none()
+
+
+# ------------------------------------------------------------------
+# ✅ 1. Full (re)build: used on first read and as a repair path
+# ------------------------------------------------------------------
+def build_store_view(db: Session, user_id: str) -> UserStoreView:
+    product_ids = _store_product_ids(db, user_id)
+
+    view = _lock_view(db, user_id) or UserStoreView(user_id=user_id)
+    _save(db, view, _load_products(db, product_ids))
+    db.add(view)
+    try:
+        db.commit()
+    except IntegrityError:
+        # ✅ Concurrent first reads: another request inserted the view first, use theirs
+        db.rollback()
+        view = db.get(UserStoreView, user_id, populate_existing=True)
+    return view
+
+
+# ------------------------------------------------------------------
+# ✅ 2. Incremental updates, staged in the caller's transaction
+# ------------------------------------------------------------------
+def _store_product_ids(db: Session, user_id: str) -> list[str]:
+    return db.execute(
+        select(UserStore.product_id).where(UserStore.user_id == user_id).order_by(UserStore.id)
+    ).scalars().all()
+
+
+def _lock_or_insert_view(db: Session, user_id: str):
+    """Locked existing view, or None after inserting one built from the current store rows.
+
+    Skipping users without a view could lose a change to a concurrent first
+    build_store_view that read the rows before the caller's write.
+    """
+    view = _lock_view(db, user_id)
+    if view is not None:
+        return view
+    try:
+        with db.begin_nested():
+            db.add(_save(db, UserStoreView(user_id=user_id), _load_products(db, _store_product_ids(db, user_id))))
+        return None
+    except IntegrityError:
+        return _lock_view(db, user_id)  # a concurrent build committed first: apply the change to it
+
+
+def add_to_store_view(db: Session, user_id: str, product_ids: Iterable[str]) -> None:
+    view = _lock_or_insert_view(db, user_id)
+    if view is None:
+        return  # fresh view already includes the caller's rows
+
+    products = json.loads(view.payload)
+    present = {p["basic"]["product_id"] for p in products}
+    products += _load_products(db, [pid for pid in product_ids if pid not in present])
+    _save(db, view, products)
+
+
+def remove_from_store_view(db: Session, user_id: str, product_ids: Iterable[str]) -> None:
+    view = _lock_or_insert_view(db, user_id)
+    if view is None:
+        return
+
+    removed = set(product_ids)
+    products = [p for p in json.loads(view.payload) if p["basic"]["product_id"] not in removed]
+    _save(db, view, products)
@@ -0,0 +1,254 @@
+"""End-to-end load test of the hot API endpoints against a seeded database.
+
+Seeds users, products, user_store entries and orders, then drives the real
+app (app.main:app) in-process through httpx.ASGITransport and reports
+throughput and p50/p95/p99 per scenario. Results are written as JSON so
+runs can be diffed between commits with --baseline.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api --requests 2000 --concurrency 50 --output bench.json
+    python -m benchmarks.bench_api --baseline bench.json          # compare against a previous run
+    DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_api --users 1000
+
+Without DATABASE_URL a fresh temporary SQLite database is seeded and used.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCENARIOS = ("login", "product_list", "product_detail", "my_products", "order_create", "orders_all")
+PASSWORD = "bench-password"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--store-items", type=int, default=20, help="user_store rows per user")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=1, help="random seed for request mix")
+    parser.add_argument("--output", help="write JSON results to this path (default: stdout only)")
+    parser.add_argument("--baseline", help="previous JSON results to compare against")
+    return parser.parse_args()
+
+
+# ------------------------------------------------------------------
+# ✅ Seeding (bulk inserts; one bcrypt hash shared by every user)
+# ------------------------------------------------------------------
+def seed(args) -> dict:
+    from app.core.security import hash_password
+    from app.db import SessionLocal, create_tables
+    from app.models.order_model import BillingDetails, Order
+    from app.models.product_model import ProductBasic, ProductDetails
+    from app.models.user_model import User
+    from app.models.user_store_model import UserStore
+
+    create_tables()
+    rng = random.Random(args.seed)
+    mobiles = [f"07{i:08d}" for i in range(args.users)]
+    product_ids = [f"PROD-B{i:07d}" for i in range(1, args.products + 1)]
+    categories = [f"category-{i}" for i in range(10)]
+    types = [f"type-{i}" for i in range(5)]
+
+    db = SessionLocal()
+    try:
+        if db.query(User).count() >= args.users and db.query(ProductBasic).count() >= args.products:
+            return {"mobiles": mobiles, "product_ids": product_ids}
+
+        hashed = hash_password(PASSWORD)
+        db.bulk_insert_mappings(User, [
+            {"id": i + 1, "mobile_no": m, "username": f"user{i}", "hashed_password": hashed,
+             "is_admin": False, "referral_code": f"REF{i:08d}", "points": 0}
+            for i, m in enumerate(mobiles)
+        ])
+        db.bulk_insert_mappings(ProductBasic, [
+            {"id": i, "product_id": pid, "category": categories[i % len(categories)],
+             "name": f"Bench product {i}", "type": types[i % len(types)]}
+            for i, pid in enumerate(product_ids, start=1)
+        ])
+        details = []
+        for i in range(1, args.products + 1):
+            price = round(rng.uniform(10, 500), 2)
+            actual = round(price * rng.uniform(0.4, 0.9), 2)
+            details.append({
+                "id": i, "products_id": i, "description": "Seeded for benchmarks",
+                "features": ["fast", "cheap"], "specifications": {"weight": "1kg"},
+                "images": [f"img/{i}.png"], "price": price, "actual_price": actual,
+                "profit": round(price - actual, 2), "margin": round((price - actual) / actual * 100, 2),
+                "points": i % 50,
+            })
+        db.bulk_insert_mappings(ProductDetails, details)
+
+        store_rows = []
+        for m in mobiles:
+            for pid in rng.sample(product_ids, min(args.store_items, len(product_ids))):
+                n = int(pid[6:])
+                store_rows.append({"user_id": m, "name": f"Bench product {n}", "product_id": pid,
+                                   "category": categories[n % len(categories)], "type": types[n % len(types)]})
+        db.bulk_insert_mappings(UserStore, store_rows)
+
+        start = datetime.utcnow() - timedelta(days=30)
+        db.bulk_insert_mappings(Order, [
+            {"id": i, "product_id": rng.choice(product_ids), "quantity": 1, "total_price": 10.0,
+             "status": "pending", "created_at": start + timedelta(seconds=i)}
+            for i in range(1, args.orders + 1)
+        ])
+        db.bulk_insert_mappings(BillingDetails, [
+            {"order_id": i, "name": "Bench", "email": "b@example.com", "phone": "0", "address": "-",
+             "city": "-", "zip_code": "0", "country": "LK"}
+            for i in range(1, args.orders + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return {"mobiles": mobiles, "product_ids": product_ids}
+
+
+# ------------------------------------------------------------------
+# ✅ Scenarios: each returns (method, path, json body)
+# ------------------------------------------------------------------
+def build_requests(name: str, data: dict, rng: random.Random):
+    mobiles, product_ids = data["mobiles"], data["product_ids"]
+    if name == "login":
+        return lambda: ("POST", "/auth/login", {"mobile_no": rng.choice(mobiles), "password": PASSWORD})
+    if name == "product_list":
+        return lambda: ("GET", "/admin/products?limit=50", None)
+    if name == "product_detail":
+        return lambda: ("GET", f"/user-store/products/{rng.choice(product_ids)}", None)
+    if name == "my_products":
+        return lambda: ("GET", f"/user-store/my-products/{rng.choice(mobiles)}", None)
+    if name == "order_create":
+        billing = {"name": "Bench", "email": "b@example.com", "phone": "0", "address": "-",
+                   "city": "-", "zipCode": "0", "country": "LK"}
+        return lambda: ("POST", "/orders/create", {
+            "order_data": {"product_id": rng.choice(product_ids), "quantity": 1, "total_price": 10.0},
+            "billing_data": billing,
+        })
+    if name == "orders_all":
+        return lambda: ("GET", "/orders/all", None)
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def percentile(ordered: list, q: float) -> float:
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def run_scenario(client, next_request, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, body = next_request()
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'scenario':<16}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}" + ("  vs baseline" if baseline else ""))
+    for name, r in results["scenarios"].items():
+        line = f"{name:<16}{r['req_per_s']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}"
+        before = (baseline or {}).get("scenarios", {}).get(name)
+        if before:
+            rps = (r["req_per_s"] / before["req_per_s"] - 1) * 100
+            p95 = (r["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+            line += f"  req/s {rps:+.1f}%  p95 {p95:+.1f}%"
+        print(line)
+
+
+async def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.gettempdir(), "store_bench_api.db")
+        if os.path.exists(path):
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("DB_POOL_SIZE", "20")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "20")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    seed_started = time.perf_counter()
+    data = seed(args)
+    seed_seconds = time.perf_counter() - seed_started
+
+    import httpx
+    from app.main import app, lifespan
+
+    rng = random.Random(args.seed)
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+        "config": {k: getattr(args, k) for k in ("users", "products", "store_items", "orders", "requests", "concurrency", "seed")},
+        "seed_seconds": round(seed_seconds, 3),
+        "scenarios": {},
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Authenticated like a real client, so the token cache is on the measured path
+            login = await client.post("/auth/login", json={"mobile_no": data["mobiles"][0], "password": PASSWORD})
+            client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+            for name in scenarios:
+                next_request = build_requests(name, data, rng)
+                # Warm-up: populate caches, views and pool connections before timing
+                await run_scenario(client, next_request, min(args.concurrency, args.requests), args.concurrency)
+                results["scenarios"][name] = await run_scenario(client, next_request, args.requests, args.concurrency)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    asyncio.run(main())
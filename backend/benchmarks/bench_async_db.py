@@ -0,0 +1,122 @@
+"""Compare sync (threadpool) vs async DB endpoints under high concurrency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_db --concurrency 1000 --orders 5000
+    DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_async_db
+
+Without DATABASE_URL a temporary SQLite database is seeded and used.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    return parser.parse_args()
+
+
+def seed(n_orders: int):
+    from app.db import SessionLocal, create_tables
+    from app.models.order_model import BillingDetails, Order
+    from app.models.product_model import ProductBasic, ProductDetails
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        if db.query(Order).count() >= n_orders:
+            return
+        db.add(ProductBasic(id=1, product_id="PROD-BENCH001", category="bench", name="Bench", type="bench"))
+        db.add(ProductDetails(products_id=1, images=["bench.png"], price=10, actual_price=5, profit=5, margin=100, points=1))
+        start = datetime.utcnow() - timedelta(days=30)
+        db.bulk_insert_mappings(Order, [
+            {"id": i, "product_id": "PROD-BENCH001", "quantity": 1, "total_price": 10.0,
+             "status": "pending", "created_at": start + timedelta(seconds=i)}
+            for i in range(1, n_orders + 1)
+        ])
+        db.bulk_insert_mappings(BillingDetails, [
+            {"order_id": i, "name": "Bench", "email": "b@example.com", "phone": "0", "address": "-",
+             "city": "-", "zip_code": "0", "country": "LK"}
+            for i in range(1, n_orders + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_sync_route(app):
+    """Mount the pre-async version of /orders/feed for comparison"""
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+    from app.db import get_db
+    from app.services.order_feed import fetch_order_feed
+
+    @app.get("/bench/sync-feed")
+    def sync_feed(limit: int = 50, db: Session = Depends(get_db)):
+        items, next_cursor = fetch_order_feed(db, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
+
+
+async def run(client, path: str, concurrency: int) -> dict:
+    latencies = []
+
+    async def one():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": concurrency,
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(concurrency / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+    }
+
+
+async def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.gettempdir(), "store_bench_async.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("DB_POOL_SIZE", "20")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "20")
+
+    seed(args.orders)
+
+    import httpx
+    from app.main import app
+
+    build_sync_route(app)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm up connections on both engines
+        await client.get(f"/bench/sync-feed?limit={args.page_size}")
+        await client.get(f"/orders/feed?limit={args.page_size}")
+
+        sync_result = await run(client, f"/bench/sync-feed?limit={args.page_size}", args.concurrency)
+        async_result = await run(client, f"/orders/feed?limit={args.page_size}", args.concurrency)
+
+    print(f"database: {os.environ['DATABASE_URL'].split('://', 1)[0]}  concurrency: {args.concurrency}")
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}")
+    for name, result in (("sync", sync_result), ("async", async_result)):
+        print(f"{name:<8}{result['req_per_s']:>10}{result['p50_ms']:>10}{result['p99_ms']:>10}{result['seconds']:>10}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""Insert throughput of random vs time-ordered string keys.
+
+Each scheme fills its own table keyed by a VARCHAR primary key (clustered in
+InnoDB) in batches and reports rows/s overall and for the first and last
+10% of inserts, plus how many keys collided while generating them.
+
+    uuid8  PROD- + 8 hex chars of uuid4 (old product_id)
+    uuid4  36-char uuid4 string (old stores.store_id)
+    ulid   PROD- + ULID (app.core.ids)
+
+Usage (from backend/):
+    python -m benchmarks.bench_ids --rows 500000
+    DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_ids --rows 2000000
+
+Without DATABASE_URL a temporary SQLite database is used.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--schemes", default="uuid8,uuid4,ulid")
+    parser.add_argument("--output", help="write JSON results to this path")
+    return parser.parse_args()
+
+
+def generators():
+    from app.core.ids import new_product_id
+
+    return {
+        "uuid8": lambda: f"PROD-{uuid.uuid4().hex[:8].upper()}",
+        "uuid4": lambda: str(uuid.uuid4()),
+        "ulid": new_product_id,
+    }
+
+
+def run_scheme(engine, name: str, make_key, rows: int, batch_size: int) -> dict:
+    from sqlalchemy import Column, MetaData, String, Table, insert
+
+    metadata = MetaData()
+    table = Table(f"bench_ids_{name}", metadata, Column("id", String(50), primary_key=True), Column("payload", String(100)))
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    seen, collisions, timings = set(), 0, []
+    payload = "x" * 60
+    with engine.connect() as conn:
+        for start in range(0, rows, batch_size):
+            batch = []
+            while len(batch) < min(batch_size, rows - start):
+                key = make_key()
+                if key in seen:
+                    collisions += 1  # would have been an IntegrityError + retry
+                    continue
+                seen.add(key)
+                batch.append({"id": key, "payload": payload})
+            started = time.perf_counter()
+            conn.execute(insert(table), batch)
+            conn.commit()
+            timings.append((len(batch), time.perf_counter() - started))
+
+    metadata.drop_all(engine)
+    tenth = max(len(timings) // 10, 1)
+
+    def rate(part):
+        return round(sum(n for n, _ in part) / sum(t for _, t in part), 1)
+
+    return {
+        "rows": rows,
+        "collisions": collisions,
+        "rows_per_s": rate(timings),
+        "first_10pct_rows_per_s": rate(timings[:tenth]),
+        "last_10pct_rows_per_s": rate(timings[-tenth:]),
+    }
+
+
+def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.gettempdir(), "store_bench_ids.db")
+        if os.path.exists(path):
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from app.db import engine
+
+    makers = generators()
+    results = {name: run_scheme(engine, name, makers[name], args.rows, args.batch_size) for name in args.schemes.split(",")}
+
+    print(f"database: {os.environ['DATABASE_URL'].split('://', 1)[0]}  rows: {args.rows}")
+    print(f"{'scheme':<8}{'rows/s':>12}{'first 10%':>12}{'last 10%':>12}{'collisions':>12}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['rows_per_s']:>12}{r['first_10pct_rows_per_s']:>12}{r['last_10pct_rows_per_s']:>12}{r['collisions']:>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
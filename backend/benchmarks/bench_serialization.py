@@ -0,0 +1,91 @@
+"""Serialization cost per N products: Pydantic double validation vs tuple + orjson.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --products 10000 --repeat 5
+
+No database is needed; rows are synthesized in memory.
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+
+def make_rows(n: int) -> list[tuple]:
+    return [
+        (
+            i, f"PROD-{i:08X}", "electronics", f"Product {i}", "gadget",
+            i, i, "A reasonably long product description " * 3,
+            ["Waterproof", "Bluetooth 5.3", "Fast charge"],
+            [{"label": "Weight", "value": "120g"}, {"label": "Color", "value": "Black"}],
+            [f"https://cdn.example.com/{i}/1.jpg", f"https://cdn.example.com/{i}/2.jpg"],
+            19.99, 12.5, 7.49, 59.92, 10,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def as_orm_like(rows: list[tuple]) -> list[tuple]:
+    pairs = []
+    for r in rows:
+        basic = SimpleNamespace(id=r[0], product_id=r[1], category=r[2], name=r[3], type=r[4])
+        details = SimpleNamespace(
+            id=r[5], products_id=r[6], description=r[7], features=r[8], specifications=r[9],
+            images=r[10], price=r[11], actual_price=r[12], profit=r[13], margin=r[14], points=r[15],
+        )
+        pairs.append((basic, details))
+    return pairs
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from pydantic import TypeAdapter
+    from app.schemas.product_schema import ProductOut, ProductBasicOut, ProductDetailsOut
+    from app.services.product_catalog import encode_product_row
+
+    rows = make_rows(args.products)
+    pairs = as_orm_like(rows)
+    response_adapter = TypeAdapter(list[ProductOut])
+
+    def pydantic_path():
+        # Previous list endpoints: model_validate per row, then response_model validation + dump
+        products = [
+            ProductOut(
+                basic=ProductBasicOut.model_validate(basic, from_attributes=True),
+                details=ProductDetailsOut.model_validate(details, from_attributes=True),
+            )
+            for basic, details in pairs
+        ]
+        response_adapter.dump_json(response_adapter.validate_python(products))
+
+    def trusted_path():
+        b"[" + b",".join(encode_product_row(row) for row in rows) + b"]"
+
+    before = best_of(pydantic_path, args.repeat)
+    after = best_of(trusted_path, args.repeat)
+
+    per_10k = 10000 / args.products
+    print(f"products: {args.products}  (best of {args.repeat})")
+    print(f"{'path':<22}{'total ms':>12}{'ms / 10k':>12}")
+    print(f"{'pydantic (before)':<22}{before * 1000:>12.1f}{before * 1000 * per_10k:>12.1f}")
+    print(f"{'tuple + orjson (after)':<22}{after * 1000:>12.1f}{after * 1000 * per_10k:>12.1f}")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
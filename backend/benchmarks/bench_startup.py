@@ -0,0 +1,93 @@
+"""Measure worker cold-start: fresh interpreter -> app imported -> lifespan done -> first response.
+
+Each run is a new subprocess, as a freshly scaled-out uvicorn worker would be.
+Compares the default mode (schema created by `python -m app.cli init-db`)
+with DB_CREATE_TABLES_ON_STARTUP=true.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 10
+    DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import httpx
+from app.main import app, lifespan
+from app.core.metrics import metrics
+imported = time.perf_counter()
+
+async def main():
+    async with lifespan(app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/user-store/products/PROD-MISSING")).status_code
+        first = time.perf_counter()
+    print(json.dumps({
+        "import_s": imported - started,
+        "ready_s": ready - started,
+        "first_response_s": first - started,
+        "phases": metrics.startup_seconds,
+    }))
+
+asyncio.run(main())
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this path")
+    return parser.parse_args()
+
+
+def run_child(env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    summary = {}
+    for key in ("import_s", "ready_s", "first_response_s"):
+        values = [s[key] for s in samples]
+        summary[key] = {"median": round(statistics.median(values), 4), "max": round(max(values), 4)}
+    return summary
+
+
+def main():
+    args = parse_args()
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=backend, LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"))
+    if "DATABASE_URL" not in env:
+        path = os.path.join(tempfile.gettempdir(), "store_bench_startup.db")
+        env["DATABASE_URL"] = f"sqlite:///{path}"
+
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, cwd=backend, check=True, capture_output=True)
+
+    results = {}
+    for mode, create in (("init-db (default)", "false"), ("create_all on startup", "true")):
+        mode_env = dict(env, DB_CREATE_TABLES_ON_STARTUP=create)
+        samples = [run_child(mode_env) for _ in range(args.runs)]
+        results[mode] = {"summary": summarize(samples), "last_phases": samples[-1]["phases"]}
+
+    print(f"database: {env['DATABASE_URL'].split('://', 1)[0]}  runs: {args.runs}")
+    print(f"{'mode':<24}{'import s':>10}{'ready s':>10}{'first resp s':>14}")
+    for mode, result in results.items():
+        s = result["summary"]
+        print(f"{mode:<24}{s['import_s']['median']:>10}{s['ready_s']['median']:>10}{s['first_response_s']['median']:>14}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
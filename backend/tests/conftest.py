@@ -0,0 +1,60 @@
+# tests/conftest.py
+import os
+import tempfile
+
+# Settings are read at import time: point the app at a throwaway SQLite file first
+_tmp = tempfile.mkdtemp(prefix="store-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["ASYNC_DATABASE_URL"] = ""
+os.environ["JOB_WORKER_THREADS"] = "0"  # tests run jobs explicitly
+os.environ["LOG_FILE"] = ""
+
+import pytest
+from app.db import Base, SessionLocal, create_tables, engine
+
+create_tables()
+
+
+def _clear_caches():
+    from app.core.auth import token_cache
+    from app.core.http_cache import _version_cache
+    from app.services.points import balance_cache
+    from app.services.product_catalog import count_cache, product_cache
+    from app.services.product_search import search_index
+    from app.services.referral_graph import leaderboard
+
+    for cache in (token_cache, _version_cache, balance_cache, count_cache, product_cache):
+        cache.clear()
+    leaderboard.clear()
+    session = SessionLocal()
+    try:
+        search_index.rebuild(session, None)
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    _clear_caches()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
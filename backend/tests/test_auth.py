@@ -0,0 +1,39 @@
+# tests/test_auth.py
+import pytest
+from app.config import settings
+from app.core.security import create_access_token
+from app.models.user_model import User
+
+PRODUCT = {"name": "Lamp", "category": "home", "type": "light", "price": 10, "actual_price": 6}
+
+
+def _user(db, mobile_no: str, is_admin: bool) -> dict:
+    db.add(User(mobile_no=mobile_no, username="u" + mobile_no[-3:], hashed_password="x",
+                referral_code="R" + mobile_no, is_admin=is_admin))
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': mobile_no})}"}
+
+
+def test_anonymous_admin_call_allowed_while_auth_optional(client):
+    assert client.post("/admin/products", json=PRODUCT).status_code == 200
+
+
+def test_anonymous_admin_call_rejected_when_auth_required(client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_REQUIRED", True)
+    assert client.post("/admin/products", json=PRODUCT).status_code == 401
+
+
+def test_non_admin_token_is_forbidden(client, db):
+    headers = _user(db, "0700000001", is_admin=False)
+    assert client.post("/admin/products", json=PRODUCT, headers=headers).status_code == 403
+
+
+def test_admin_token_is_accepted(client, db):
+    headers = _user(db, "0700000002", is_admin=True)
+    assert client.post("/admin/products", json=PRODUCT, headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("token", ["W10.W10.abc", "MQ.MQ.abc", "not-a-token", "a.b.c"])
+def test_malformed_tokens_are_401(client, token):
+    response = client.get("/admin/cache/stats", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
@@ -0,0 +1,51 @@
+# tests/test_http_cache.py
+from app.core.http_cache import ORDERS, PRODUCTS, _version_cache, bump_version, current_etag
+from app.services.product_catalog import ALL_PRODUCTS_KEY, product_cache
+
+PRODUCT = {"name": "Lamp", "category": "home", "type": "light", "price": 10, "actual_price": 6}
+
+
+def test_matching_etag_gets_304(client):
+    first = client.get("/admin/products")
+    assert first.status_code == 200
+
+    again = client.get("/admin/products", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_product_write_changes_etag(client):
+    before = client.get("/admin/products").headers["etag"]
+    client.post("/admin/products", json=PRODUCT)
+
+    response = client.get("/admin/products", headers={"If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["etag"] != before
+    assert [p["basic"]["name"] for p in response.json()] == ["Lamp"]
+
+
+def test_bump_returns_new_versions_and_clears_cache(db):
+    assert current_etag(db, PRODUCTS) == '"products.0"'  # cached until a bump
+    assert bump_version(PRODUCTS, ORDERS) == {PRODUCTS: 1, ORDERS: 1}
+    assert _version_cache.get((PRODUCTS,)) is None
+    assert current_etag(db, PRODUCTS) == '"products.1"'
+
+
+def test_cached_list_from_an_older_version_is_not_served(client):
+    etag = client.get("/admin/products").headers["etag"]
+    product_cache.set(ALL_PRODUCTS_KEY, (etag, b'["stale"]'))
+    bump_version(PRODUCTS)  # e.g. a write on another worker
+
+    response = client.get("/admin/products")
+    assert response.headers["etag"] != etag
+    assert response.json() == []
+
+
+def test_orders_feed_etag_covers_orders(client):
+    before = client.get("/orders/feed").headers["etag"]
+    client.post("/orders/create", json={
+        "order_data": {"product_id": "P1", "quantity": 1, "total_price": 5},
+        "billing_data": {"name": "a", "email": "e", "phone": "1", "address": "x", "city": "c",
+                         "zipCode": "1", "country": "LK"},
+    })
+    assert client.get("/orders/feed", headers={"If-None-Match": before}).status_code == 200
@@ -0,0 +1,56 @@
+# tests/test_idempotency.py
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, update
+from app.models.order_model import IdempotencyRecord, Order
+from app.services.idempotency import purge_expired
+
+BILLING = {"name": "a", "email": "e", "phone": "1", "address": "x", "city": "c", "zipCode": "1", "country": "LK"}
+ORDER = {"order_data": {"product_id": "P1", "quantity": 1, "total_price": 5}, "billing_data": BILLING}
+BATCH = {"items": [{"product_id": "P1", "quantity": 1, "total_price": 5}], "billing_data": BILLING}
+
+
+def _orders(db) -> int:
+    return db.execute(select(func.count(Order.id))).scalar()
+
+
+def _age_keys(db) -> None:
+    db.execute(update(IdempotencyRecord).values(created_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+
+
+def test_retry_with_same_key_replays_the_response(client, db):
+    headers = {"Idempotency-Key": "k1"}
+    first = client.post("/orders/create", json=ORDER, headers=headers)
+    again = client.post("/orders/create", json=ORDER, headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert _orders(db) == 1
+
+
+def test_key_reused_for_another_endpoint_conflicts(client, db):
+    headers = {"Idempotency-Key": "k1"}
+    assert client.post("/orders/create", json=ORDER, headers=headers).status_code == 200
+
+    response = client.post("/orders/batch", json=BATCH, headers=headers)
+    assert response.status_code == 409
+    assert _orders(db) == 1
+
+
+def test_expired_key_is_free_again(client, db):
+    headers = {"Idempotency-Key": "k1"}
+    first = client.post("/orders/create", json=ORDER, headers=headers).json()
+    _age_keys(db)
+
+    second = client.post("/orders/create", json=ORDER, headers=headers).json()
+    assert second["order_id"] != first["order_id"]
+    assert _orders(db) == 2
+
+
+def test_purge_removes_only_expired_keys(client, db):
+    client.post("/orders/create", json=ORDER, headers={"Idempotency-Key": "old"})
+    _age_keys(db)
+    client.post("/orders/create", json=ORDER, headers={"Idempotency-Key": "new"})
+
+    assert purge_expired(db) == 1
+    assert db.execute(select(IdempotencyRecord.key)).scalars().all() == ["new"]
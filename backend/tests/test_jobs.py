@@ -0,0 +1,81 @@
+# tests/test_jobs.py
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from app.models.job_model import Job
+from app.services.jobs import HANDLERS, claim, enqueue, run_job
+
+KIND = "test.job"
+
+
+def _job(db, **options) -> int:
+    enqueue(db, KIND, {"n": 1}, **options)
+    db.commit()
+    return db.query(Job.id).scalar()
+
+
+def _get(db, job_id: int) -> Job:
+    db.expire_all()
+    return db.get(Job, job_id)
+
+
+def _expire_lease(db, job_id: int) -> None:
+    db.execute(update(Job).where(Job.id == job_id).values(locked_until=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+def test_job_runs_once(db, monkeypatch):
+    ran = []
+    monkeypatch.setitem(HANDLERS, KIND, lambda db, payload: ran.append(payload))
+    job_id = _job(db, dedup_key="k")
+    assert not enqueue(db, KIND, {"n": 2}, dedup_key="k")
+
+    assert claim(db, "w1", 10) == [job_id]
+    assert claim(db, "w2", 10) == []  # leased
+    assert run_job(job_id, "w1")
+
+    job = _get(db, job_id)
+    assert (job.status, job.attempts, job.locked_until) == ("done", 1, None)
+    assert ran == [{"n": 1}]
+
+
+def test_failure_backs_off_then_dead_letters(db, monkeypatch):
+    monkeypatch.setitem(HANDLERS, KIND, lambda db, payload: 1 / 0)
+    job_id = _job(db, max_attempts=2)
+
+    claim(db, "w1", 10)
+    assert not run_job(job_id, "w1")
+    job = _get(db, job_id)
+    assert (job.status, job.attempts) == ("pending", 1)
+    assert job.run_at > datetime.utcnow() and "ZeroDivisionError" in job.last_error
+
+    db.execute(update(Job).values(run_at=datetime.utcnow()))
+    db.commit()
+    claim(db, "w1", 10)
+    assert not run_job(job_id, "w1")
+    assert (_get(db, job_id).status, _get(db, job_id).attempts) == ("failed", 2)
+
+
+def test_crashed_worker_lease_is_reclaimed(db, monkeypatch):
+    ran = []
+    monkeypatch.setitem(HANDLERS, KIND, lambda db, payload: ran.append(payload))
+    job_id = _job(db)
+    claim(db, "crashed", 10)
+    _expire_lease(db, job_id)
+
+    assert claim(db, "w2", 10) == [job_id]
+    assert not run_job(job_id, "crashed")  # a slow worker that lost its lease writes nothing
+    assert run_job(job_id, "w2")
+    job = _get(db, job_id)
+    assert (job.status, job.attempts, job.locked_by) == ("done", 2, "w2")
+    assert len(ran) == 2  # the lost run's writes were rolled back
+
+
+def test_expired_lease_on_last_attempt_is_dead_lettered(db):
+    job_id = _job(db, max_attempts=1)
+    claim(db, "crashed", 10)
+    _expire_lease(db, job_id)
+
+    assert claim(db, "w2", 10) == []
+    job = _get(db, job_id)
+    assert (job.status, job.attempts) == ("failed", 1)
+    assert job.last_error == "Lease expired on the last attempt"
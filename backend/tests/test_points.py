@@ -0,0 +1,37 @@
+# tests/test_points.py
+from datetime import datetime, timedelta
+from app.models.points_model import PointsLedger
+from app.models.user_model import User
+from app.services.points import add_points, balance_cache, compact_points, get_balance
+
+OLD = datetime.utcnow() - timedelta(days=1)
+
+
+def _user(db) -> int:
+    user = User(mobile_no="0700000001", username="u", hashed_password="x", referral_code="R1", points=0)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def test_compaction_folds_old_rows(db):
+    user_id = _user(db)
+    db.add_all([PointsLedger(user_id=user_id, delta=d, reason="t", created_at=OLD) for d in (5, 7)])
+    db.commit()
+
+    assert compact_points(db)["compacted"] == 2
+    assert db.get(User, user_id).points == 12
+    assert compact_points(db)["compacted"] == 0
+    balance_cache.clear()
+    assert get_balance(db, user_id) == 12
+
+
+def test_compaction_stops_below_a_young_row_with_a_lower_id(db):
+    user_id = _user(db)
+    add_points(db, user_id, 3, "young")  # lower id, but created inside the lag window
+    db.add(PointsLedger(user_id=user_id, delta=4, reason="old", created_at=OLD))
+    db.commit()
+
+    assert compact_points(db)["compacted"] == 0
+    balance_cache.clear()
+    assert get_balance(db, user_id) == 7
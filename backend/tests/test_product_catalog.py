@@ -0,0 +1,41 @@
+# tests/test_product_catalog.py
+import orjson
+import pytest
+from pydantic import ValidationError
+from app.config import settings
+from app.schemas.product_schema import ProductOut
+from app.services.product_catalog import encode_product_row, product_dict
+
+ROW = (
+    7, "PROD-TEST", "shoes", "Runner", "sneaker",
+    11, 7, "Light trainer", ["breathable"], [{"label": "size", "value": "42"}], ["a.png"],
+    120, 80.5, 39.5, 49.07, 3,
+)
+
+
+@pytest.fixture
+def validate_payloads(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATE_PRODUCT_PAYLOADS", True)
+
+
+def test_product_dict_matches_product_out(validate_payloads):
+    product = product_dict(*ROW)
+    assert ProductOut.model_validate(product).model_dump() == product
+
+
+def test_product_dict_field_order_matches_schema(validate_payloads):
+    product = product_dict(*ROW)
+    out = ProductOut.model_validate(product).model_dump()
+    assert list(product) == list(out)
+    assert list(product["basic"]) == list(out["basic"])
+    assert list(product["details"]) == list(out["details"])
+
+
+def test_encoded_row_matches_pydantic_json(validate_payloads):
+    expected = ProductOut.model_validate(product_dict(*ROW)).model_dump_json()
+    assert orjson.loads(encode_product_row(ROW)) == orjson.loads(expected)
+
+
+def test_invalid_row_is_rejected_when_validation_is_on(validate_payloads):
+    with pytest.raises(ValidationError):
+        product_dict(*((None,) + ROW[1:]))
@@ -0,0 +1,91 @@
+# tests/test_referrals.py
+from sqlalchemy import select
+from app.models.referral_model import ReferralPath
+from app.models.user_model import User
+from app.services.job_handlers import REFERRAL_APPLY
+from app.services.jobs import claim, enqueue, run_job
+from app.services.referral_graph import get_referral_stats, rebuild_referral_stats
+
+
+def _users(db, *names: str) -> dict:
+    users = {name: User(mobile_no=f"07000000{i:02d}", username=name, hashed_password="x", referral_code=name.upper())
+             for i, name in enumerate(names)}
+    db.add_all(users.values())
+    db.commit()
+    return {name: user.id for name, user in users.items()}
+
+
+def _refer(db, referrer: str, new_user_id: int) -> None:
+    enqueue(db, REFERRAL_APPLY, {"referral_code": referrer.upper(), "new_user_id": new_user_id})
+    db.commit()
+
+
+def _drain(db) -> None:
+    while claimed := claim(db, "test", 100):
+        for job_id in claimed:
+            assert run_job(job_id, "test")
+
+
+def _paths(db) -> set:
+    return set(db.execute(select(ReferralPath.ancestor_id, ReferralPath.descendant_id, ReferralPath.depth)).all())
+
+
+def _stats(db, ids: dict) -> dict:
+    db.expire_all()
+    return {name: get_referral_stats(db, user_id) for name, user_id in ids.items()}
+
+
+def test_chain_builds_closure_and_increments_ancestors(db):
+    ids = _users(db, "ann", "bob", "cat", "dan")
+    for referrer, new in (("ann", "bob"), ("bob", "cat"), ("ann", "dan")):
+        _refer(db, referrer, ids[new])
+        _drain(db)
+
+    assert _paths(db) == {
+        (ids["ann"], ids["bob"], 1), (ids["bob"], ids["cat"], 1),
+        (ids["ann"], ids["cat"], 2), (ids["ann"], ids["dan"], 1),
+    }
+    stats = _stats(db, ids)
+    assert {k: stats["ann"][k] for k in ("level", "direct_count", "downstream_count", "max_depth", "points_earned")} \
+        == {"level": 0, "direct_count": 2, "downstream_count": 3, "max_depth": 2, "points_earned": 20}
+    assert stats["bob"]["level"] == 1 and stats["bob"]["downstream_count"] == 1
+    assert stats["cat"]["level"] == 2 and stats["cat"]["downstream_count"] == 0
+
+
+def test_increments_match_a_full_rebuild(db):
+    ids = _users(db, "ann", "bob", "cat", "dan", "eve")
+    for referrer, new in (("ann", "bob"), ("bob", "cat"), ("cat", "dan"), ("bob", "eve")):
+        _refer(db, referrer, ids[new])
+        _drain(db)
+    incremental = _stats(db, ids)
+
+    rebuild_referral_stats(db)
+    assert _stats(db, ids) == incremental
+
+
+def test_replayed_referral_is_ignored(db):
+    ids = _users(db, "ann", "bob")
+    _refer(db, "ann", ids["bob"])
+    _drain(db)
+    _refer(db, "ann", ids["bob"])  # e.g. a job re-enqueued without its dedup key
+    _drain(db)
+
+    assert _stats(db, ids)["ann"]["direct_count"] == 1
+    assert len(_paths(db)) == 1
+
+
+def test_referrals_applied_out_of_order_build_the_same_tree(db):
+    ids = _users(db, "ann", "bob", "cat", "dan")
+    for referrer, new in (("cat", "dan"), ("bob", "cat"), ("ann", "bob")):  # leaves first
+        _refer(db, referrer, ids[new])
+        _drain(db)
+
+    assert _paths(db) == {
+        (ids["ann"], ids["bob"], 1), (ids["ann"], ids["cat"], 2), (ids["ann"], ids["dan"], 3),
+        (ids["bob"], ids["cat"], 1), (ids["bob"], ids["dan"], 2), (ids["cat"], ids["dan"], 1),
+    }
+    incremental = _stats(db, ids)
+    assert incremental["dan"]["level"] == 3 and incremental["ann"]["max_depth"] == 3
+
+    rebuild_referral_stats(db)
+    assert _stats(db, ids) == incremental
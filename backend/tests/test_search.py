@@ -0,0 +1,34 @@
+# tests/test_search.py
+from app.core.http_cache import bump_version, PRODUCTS
+from app.services.product_search import search_index
+
+PRODUCT = {"name": "Desk Lamp", "category": "home", "type": "light", "price": 10, "actual_price": 6}
+
+
+def _count_rebuilds(monkeypatch) -> list:
+    calls = []
+    rebuild = search_index.rebuild
+    monkeypatch.setattr(search_index, "rebuild", lambda *a, **kw: calls.append(1) or rebuild(*a, **kw))
+    return calls
+
+
+def test_local_write_does_not_force_a_rebuild(client, monkeypatch):
+    client.get("/products/search", params={"q": "lamp"})  # index at the current version
+    rebuilds = _count_rebuilds(monkeypatch)
+
+    client.post("/admin/products", json=PRODUCT)
+    hits = client.get("/products/search", params={"q": "desk"}).json()
+
+    assert [hit["name"] for hit in hits["results"]] == ["Desk Lamp"]
+    assert rebuilds == []
+
+
+def test_write_on_another_worker_rebuilds(client, monkeypatch):
+    client.get("/products/search", params={"q": "lamp"})
+    rebuilds = _count_rebuilds(monkeypatch)
+
+    bump_version(PRODUCTS)  # another worker's write
+    client.post("/admin/products", json=PRODUCT)
+    client.get("/products/search", params={"q": "desk"})
+
+    assert rebuilds == [1]
@@ -0,0 +1,30 @@
+# tests/test_snapshot_export.py
+from datetime import datetime, timedelta
+from app.models.order_model import Order
+from app.services.snapshot_export import export_table
+
+OLD = datetime.utcnow() - timedelta(days=1)
+
+
+def _order(created_at) -> Order:
+    return Order(product_id="P1", quantity=1, total_price=5, created_at=created_at)
+
+
+def test_export_advances_past_old_rows(db, tmp_path):
+    db.add_all([_order(OLD), _order(OLD)])
+    db.commit()
+
+    result = export_table(db, "orders", str(tmp_path))
+    assert (result.rows, result.to_id) == (2, 2)
+    assert export_table(db, "orders", str(tmp_path)).rows == 0
+
+
+def test_export_stops_at_a_young_row_with_a_lower_id(db, tmp_path):
+    db.add_all([_order(OLD), _order(datetime.utcnow()), _order(OLD)])
+    db.commit()
+
+    result = export_table(db, "orders", str(tmp_path), chunk_size=2)
+    assert (result.rows, result.to_id) == (1, 1)
+
+    later = export_table(db, "orders", str(tmp_path), lag_seconds=0)
+    assert (later.from_id, later.rows, later.to_id) == (1, 2, 3)